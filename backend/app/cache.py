@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from itertools import chain
+from threading import Lock
+from typing import Any, Hashable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import settings
+
+
+class LRUCache:
+    """Thread-safe, size-bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, tuple[Hashable, Any]] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, version: Hashable = None) -> Optional[Any]:
+        """Return the cached value, treating entries stored for another ``version`` as misses."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                if entry is not None:
+                    del self._entries[key]
+                    self.invalidations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, version: Hashable = None) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+# Assembled ``BonsaiDetail`` graphs keyed by bonsai id. Entries are versioned with
+# the change fingerprint they were built from, so writes made by another process
+# are caught even though they never reach the invalidation hooks below.
+detail_cache = LRUCache(settings.detail_cache_size)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_stale_details(session: Session, flush_context) -> None:
+    stale: set[int] = session.info.setdefault("stale_bonsai_ids", set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, models.Bonsai):
+            stale.add(obj.id)
+        elif isinstance(obj, models.BONSAI_CHILD_MODELS) and obj.bonsai_id:
+            stale.add(obj.bonsai_id)
+        elif isinstance(obj, models.Species):
+            # Species are embedded in every tree's detail; edits are rare enough to drop all.
+            session.info["stale_all_details"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_stale_details(session: Session) -> None:
+    stale = session.info.pop("stale_bonsai_ids", set())
+    if session.info.pop("stale_all_details", False):
+        detail_cache.clear()
+        return
+    for bonsai_id in stale:
+        detail_cache.invalidate(bonsai_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_stale_details(session: Session) -> None:
+    session.info.pop("stale_bonsai_ids", None)
+    session.info.pop("stale_all_details", None)
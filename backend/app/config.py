@@ -1,4 +1,6 @@
 from pathlib import Path
+from typing import Optional
+
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -11,6 +13,25 @@ class Settings(BaseSettings):
     media_url: str = Field(default="/media")
     thumbnail_size: int = Field(default=512)
     api_prefix: str = Field(default="/api")
+    detail_cache_size: int = Field(default=256)
+    image_workers: int = Field(default=2, ge=1)
+    image_queue_depth: int = Field(default=8, ge=0)
+    max_photo_upload_bytes: int = Field(default=50 * 1024 * 1024)
+    max_backup_upload_bytes: int = Field(default=8 * 1024 * 1024 * 1024)
+    max_batch_photo_files: int = Field(default=50, ge=1)
+    max_batch_upload_bytes: int = Field(default=1024 * 1024 * 1024)
+    upload_chunk_size: int = Field(default=1024 * 1024, ge=1)
+    upload_tmp_dir: Optional[Path] = Field(default=None)
+    thumbnail_derivative_formats: list[str] = Field(default_factory=lambda: ["avif", "webp"])
+    rendition_widths: list[int] = Field(default_factory=lambda: [256, 512, 1024, 2048])
+    rendition_root: Path = Field(
+        default_factory=lambda: Path(__file__).resolve().parent.parent / "var" / "renditions"
+    )
+    rendition_cache_bytes: int = Field(default=512 * 1024 * 1024)
+    sprite_tile_size: int = Field(default=256, ge=16)
+    sprite_columns: int = Field(default=10, ge=1)
+    max_sprite_tiles: int = Field(default=200, ge=1)
+    media_gc_grace_seconds: int = Field(default=24 * 60 * 60, ge=0)
 
     class Config:
         env_file = ".env"
@@ -21,3 +42,4 @@ settings = Settings()
 settings.media_root.mkdir(parents=True, exist_ok=True)
 (settings.media_root / "full").mkdir(parents=True, exist_ok=True)
 (settings.media_root / "thumbs").mkdir(parents=True, exist_ok=True)
+settings.rendition_root.mkdir(parents=True, exist_ok=True)
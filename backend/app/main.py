@@ -1,25 +1,52 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
 from .config import settings
-from .database import Base, engine
+from .migrations import ensure_current
+from .photo_jobs import photo_jobs as photo_job_queue
 from .routers import (
     accolades,
+    admin,
     backup,
     bonsai,
     measurements,
+    media,
+    metrics,
     notifications,
+    photo_jobs,
     photos,
+    search,
     species,
     updates,
 )
+from .utils.static import ImmutableStaticFiles
+from .utils.uploads import UploadSizeLimitMiddleware
+from .workers import image_pool
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    ensure_current()
+    await photo_job_queue.start()
+    yield
+    await photo_job_queue.stop()
+    image_pool.shutdown()
 
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="Bonsai Tracker API", version="1.0.0")
+app = FastAPI(title="Bonsai Tracker API", version="1.0.0", lifespan=lifespan)
+
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    limits=[
+        (rf"^{settings.api_prefix}/bonsai/\d+/photos/?$", settings.max_photo_upload_bytes),
+        (rf"^{settings.api_prefix}/bonsai/\d+/photos/batch/?$", settings.max_batch_upload_bytes),
+        (rf"^{settings.api_prefix}/backup/import/?$", settings.max_backup_upload_bytes),
+    ],
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -34,11 +61,16 @@ app.include_router(bonsai.router)
 app.include_router(measurements.router)
 app.include_router(updates.router)
 app.include_router(photos.router)
+app.include_router(photo_jobs.router)
 app.include_router(notifications.router)
 app.include_router(backup.router)
 app.include_router(accolades.router)
+app.include_router(search.router)
+app.include_router(metrics.router)
+app.include_router(admin.router)
+app.include_router(media.router)
 
-app.mount(settings.media_url, StaticFiles(directory=settings.media_root), name="media")
+app.mount(settings.media_url, ImmutableStaticFiles(directory=settings.media_root), name="media")
 
 
 @app.get("/")
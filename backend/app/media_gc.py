@@ -0,0 +1,226 @@
+"""Find and delete stored media files that no photo references.
+
+Run ``python -m app.media_gc`` for a report and ``--delete`` to remove the
+orphans. The media directories are walked with ``os.scandir`` and checked
+against the indexed ``photos.full_path`` / ``photos.thumbnail_path`` columns in
+batches, so neither the directory listing nor the photo table is ever held in
+memory. Orphans younger than the grace period are reported but kept: they may
+belong to an upload whose row has not been committed yet.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import settings
+from .database import SessionLocal
+from .utils.images import DERIVATIVE_FORMATS
+
+MEDIA_DIRECTORIES = ("full", "thumbs")
+BATCH_SIZE = 500
+MISSING_SAMPLE_SIZE = 100
+
+
+@dataclass
+class MediaGCReport:
+    scanned_files: int = 0
+    scanned_bytes: int = 0
+    orphaned_files: int = 0
+    orphaned_bytes: int = 0
+    # Orphans older than the grace period, which ``delete`` removes.
+    reclaimable_files: int = 0
+    reclaimable_bytes: int = 0
+    deleted_files: int = 0
+    deleted_bytes: int = 0
+    missing_files: int = 0
+    missing_sample: list[str] = field(default_factory=list)
+    grace_seconds: int = 0
+    dry_run: bool = True
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class _MediaFile:
+    path: Path
+    relative: str
+    size: int
+    mtime: float
+
+
+def _walk(directory: Path, root: Path) -> Iterator[_MediaFile]:
+    try:
+        entries = os.scandir(directory)
+    except FileNotFoundError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk(Path(entry.path), root)
+            elif entry.is_file(follow_symlinks=False):
+                stat = entry.stat(follow_symlinks=False)
+                path = Path(entry.path)
+                yield _MediaFile(path, path.relative_to(root).as_posix(), stat.st_size, stat.st_mtime)
+
+
+def iter_media_files(root: Optional[Path] = None) -> Iterator[_MediaFile]:
+    root = root or settings.media_root
+    for name in MEDIA_DIRECTORIES:
+        yield from _walk(root / name, root)
+
+
+def stored_path_for(relative: str) -> str:
+    """Return the ``photos`` column value that keeps ``relative`` alive.
+
+    Thumbnail derivatives (``thumbs/a.jpg.webp``) belong to their thumbnail.
+    """
+
+    base, dot, suffix = relative.rpartition(".")
+    if dot and suffix in DERIVATIVE_FORMATS and Path(base).suffix:
+        return base
+    return relative
+
+
+def _referenced(db: Session, candidates: Iterable[str], root: Path) -> set[str]:
+    values = set()
+    for relative in candidates:
+        # Older rows may hold absolute paths.
+        values.update((relative, str(root / relative)))
+    rows = db.execute(
+        select(models.Photo.full_path, models.Photo.thumbnail_path).where(
+            or_(models.Photo.full_path.in_(values), models.Photo.thumbnail_path.in_(values))
+        )
+    )
+    found = set()
+    for full_path, thumbnail_path in rows:
+        for value in (full_path, thumbnail_path):
+            if not value:
+                continue
+            path = Path(value)
+            if not path.is_absolute():
+                found.add(value)
+            elif path.is_relative_to(root):
+                found.add(path.relative_to(root).as_posix())
+            # Absolute paths outside the media root cannot keep a scanned file alive.
+    return found
+
+
+def _batches(items: Iterator[_MediaFile], size: int) -> Iterator[list[_MediaFile]]:
+    while batch := list(islice(items, size)):
+        yield batch
+
+
+def _find_missing(db: Session, report: MediaGCReport, root: Path) -> None:
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(models.Photo.id, models.Photo.full_path, models.Photo.thumbnail_path)
+            .where(models.Photo.id > last_id)
+            .order_by(models.Photo.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        for photo_id, *paths in rows:
+            for value in paths:
+                if not value:
+                    continue
+                path = Path(value)
+                if not path.is_absolute():
+                    path = root / path
+                if not path.is_file():
+                    report.missing_files += 1
+                    if len(report.missing_sample) < MISSING_SAMPLE_SIZE:
+                        report.missing_sample.append(f"photo {photo_id}: {value}")
+        last_id = rows[-1][0]
+
+
+def collect_garbage(
+    db: Session,
+    *,
+    delete: bool = False,
+    grace_seconds: Optional[int] = None,
+    root: Optional[Path] = None,
+) -> MediaGCReport:
+    """Report (and with ``delete``, remove) unreferenced media files."""
+
+    root = root or settings.media_root
+    grace = settings.media_gc_grace_seconds if grace_seconds is None else grace_seconds
+    report = MediaGCReport(grace_seconds=grace, dry_run=not delete)
+    cutoff = time.time() - grace
+
+    for batch in _batches(iter_media_files(root), BATCH_SIZE):
+        referenced = _referenced(db, {stored_path_for(item.relative) for item in batch}, root)
+        for item in batch:
+            report.scanned_files += 1
+            report.scanned_bytes += item.size
+            if stored_path_for(item.relative) in referenced:
+                continue
+            report.orphaned_files += 1
+            report.orphaned_bytes += item.size
+            if item.mtime > cutoff:
+                continue
+            report.reclaimable_files += 1
+            report.reclaimable_bytes += item.size
+            if delete:
+                try:
+                    # Skip a file rewritten since the walk (an upload reusing the name).
+                    if item.path.stat().st_mtime > cutoff:
+                        continue
+                    item.path.unlink()
+                except OSError:  # pragma: no cover - removed concurrently
+                    continue
+                report.deleted_files += 1
+                report.deleted_bytes += item.size
+
+    _find_missing(db, report, root)
+    return report
+
+
+def _get_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Report or delete media files no photo references.")
+    parser.add_argument("--delete", action="store_true", help="Delete orphans older than the grace period.")
+    parser.add_argument(
+        "--grace-hours",
+        type=float,
+        default=None,
+        help="Keep orphans modified within this many hours (default: MEDIA_GC_GRACE_SECONDS).",
+    )
+    return parser
+
+
+def main() -> None:
+    args = _get_arg_parser().parse_args()
+    grace = None if args.grace_hours is None else int(args.grace_hours * 3600)
+    with SessionLocal() as db:
+        report = collect_garbage(db, delete=args.delete, grace_seconds=grace)
+
+    mib = 1024 * 1024
+    print(f"Scanned {report.scanned_files} files ({report.scanned_bytes / mib:.1f} MiB).")
+    print(f"Orphaned: {report.orphaned_files} files ({report.orphaned_bytes / mib:.1f} MiB).")
+    print(
+        f"Reclaimable after the {report.grace_seconds}s grace period: "
+        f"{report.reclaimable_files} files ({report.reclaimable_bytes / mib:.1f} MiB)."
+    )
+    if args.delete:
+        print(f"Deleted {report.deleted_files} files ({report.deleted_bytes / mib:.1f} MiB).")
+    else:
+        print("Dry run; pass --delete to remove orphans outside the grace period.")
+    if report.missing_files:
+        print(f"{report.missing_files} referenced files are missing:")
+        for line in report.missing_sample:
+            print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Stored photo files shared between ``Photo`` rows by content hash."""
+from __future__ import annotations
+
+from dataclasses import fields
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import settings
+from .utils.images import DERIVATIVE_FORMATS, StoredImage, derivative_path
+
+# ``StoredImage`` fields double as ``Photo`` column names.
+_STORED_IMAGE_COLUMNS = tuple(item.name for item in fields(StoredImage))
+
+
+def resolve_media_path(stored_path: Optional[str]) -> Optional[Path]:
+    if not stored_path:
+        return None
+
+    candidate = Path(stored_path)
+    if not candidate.is_absolute():
+        candidate = settings.media_root / candidate
+
+    return candidate
+
+
+def stored_image_of(photo: models.Photo) -> StoredImage:
+    return StoredImage(**{name: getattr(photo, name) for name in _STORED_IMAGE_COLUMNS})
+
+
+def apply_stored_image(photo: models.Photo, stored: StoredImage) -> None:
+    for name in _STORED_IMAGE_COLUMNS:
+        setattr(photo, name, getattr(stored, name))
+
+
+def find_stored_copy(db: Session, content_hash: Optional[str]) -> Optional[models.Photo]:
+    """Return a processed photo whose files hold the same upload, if they are still on disk."""
+
+    if not content_hash:
+        return None
+
+    candidates = db.query(models.Photo).filter(
+        models.Photo.content_hash == content_hash,
+        models.Photo.processing_state == "ready",
+    )
+    for candidate in candidates:
+        full_path = resolve_media_path(candidate.full_path)
+        thumbnail_path = resolve_media_path(candidate.thumbnail_path)
+        if full_path and full_path.is_file() and thumbnail_path and thumbnail_path.is_file():
+            return candidate
+    return None
+
+
+def release_media(db: Session, full_path: Optional[str], thumbnail_path: Optional[str]) -> None:
+    """Delete stored files that no photo references any more.
+
+    Photos with identical content share their files, so this must run after the
+    rows that dropped these paths have been committed.
+    """
+
+    media_paths: list[Path] = []
+    if full_path and not db.query(models.Photo.id).filter(models.Photo.full_path == full_path).first():
+        candidate = resolve_media_path(full_path)
+        if candidate:
+            media_paths.append(candidate)
+
+    if thumbnail_path and not (
+        db.query(models.Photo.id).filter(models.Photo.thumbnail_path == thumbnail_path).first()
+    ):
+        thumbnail = resolve_media_path(thumbnail_path)
+        if thumbnail:
+            media_paths.append(thumbnail)
+            media_paths.extend(derivative_path(thumbnail, extension) for extension in DERIVATIVE_FORMATS)
+
+    for path in media_paths:
+        try:
+            if path.exists() and path.is_file():
+                path.unlink()
+        except OSError:  # pragma: no cover - best effort cleanup
+            continue
@@ -0,0 +1,371 @@
+"""Versioned schema migrations for the bonsai database.
+
+Migrations run as an explicit step (``python -m app.migrations upgrade``) rather
+than on import, and the applied version is recorded in ``schema_version`` so
+existing ``bonsai.db`` files can gain indexes and columns without a rebuild.
+"""
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from .database import engine
+from .search import create_search_index
+
+VERSION_TABLE = "schema_version"
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+
+def add_column(conn: Connection, table: str, column: str, definition: str) -> None:
+    """Add ``column`` to ``table`` unless it already exists.
+
+    ``ALTER TABLE ... ADD COLUMN`` only rewrites the schema record in SQLite, so
+    this is safe to run against large databases.
+    """
+
+    existing = {item["name"] for item in inspect(conn).get_columns(table)}
+    if column not in existing:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {definition}"))
+
+
+def create_index(conn: Connection, name: str, table: str, *expressions: str) -> None:
+    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(expressions)})"))
+
+
+# The tables as they stood before migrations existed, written out rather than
+# taken from the models so version 1 never changes with them. ``IF NOT EXISTS``
+# lets databases created by the old import-time ``create_all`` adopt it as is.
+_BASE_TABLES = (
+    """
+    CREATE TABLE IF NOT EXISTS species (
+        id INTEGER NOT NULL,
+        common_name VARCHAR(255) NOT NULL,
+        scientific_name VARCHAR(255),
+        description TEXT,
+        care_instructions TEXT,
+        tree_count INTEGER NOT NULL,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        PRIMARY KEY (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS bonsai (
+        id INTEGER NOT NULL,
+        name VARCHAR(255) NOT NULL,
+        species_id INTEGER,
+        acquisition_date DATE,
+        origin_date DATE,
+        location VARCHAR(255),
+        notes TEXT,
+        development_stage VARCHAR(100),
+        status VARCHAR(50) NOT NULL,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(species_id) REFERENCES species (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS bonsai_updates (
+        id INTEGER NOT NULL,
+        bonsai_id INTEGER NOT NULL,
+        title VARCHAR(255) NOT NULL,
+        description TEXT,
+        performed_at DATETIME NOT NULL,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(bonsai_id) REFERENCES bonsai (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS notifications (
+        id INTEGER NOT NULL,
+        bonsai_id INTEGER,
+        title VARCHAR(255) NOT NULL,
+        message TEXT NOT NULL,
+        category VARCHAR(100),
+        due_at DATETIME,
+        read BOOLEAN NOT NULL,
+        created_at DATETIME NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(bonsai_id) REFERENCES bonsai (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS graveyard_entries (
+        id INTEGER NOT NULL,
+        bonsai_id INTEGER NOT NULL,
+        category VARCHAR(50) NOT NULL,
+        note TEXT,
+        moved_at DATETIME NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (bonsai_id),
+        FOREIGN KEY(bonsai_id) REFERENCES bonsai (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS measurements (
+        id INTEGER NOT NULL,
+        bonsai_id INTEGER NOT NULL,
+        update_id INTEGER,
+        measured_at DATETIME NOT NULL,
+        trunk_diameter_cm FLOAT,
+        notes TEXT,
+        created_at DATETIME NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(bonsai_id) REFERENCES bonsai (id),
+        FOREIGN KEY(update_id) REFERENCES bonsai_updates (id) ON DELETE SET NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS photos (
+        id INTEGER NOT NULL,
+        bonsai_id INTEGER NOT NULL,
+        update_id INTEGER,
+        description TEXT,
+        taken_at DATETIME,
+        full_path VARCHAR(500) NOT NULL,
+        thumbnail_path VARCHAR(500) NOT NULL,
+        is_primary BOOLEAN NOT NULL,
+        created_at DATETIME NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(bonsai_id) REFERENCES bonsai (id),
+        FOREIGN KEY(update_id) REFERENCES bonsai_updates (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS accolades (
+        id INTEGER NOT NULL,
+        bonsai_id INTEGER NOT NULL,
+        title VARCHAR(255) NOT NULL,
+        photo_id INTEGER,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(bonsai_id) REFERENCES bonsai (id),
+        FOREIGN KEY(photo_id) REFERENCES photos (id)
+    )
+    """,
+)
+
+
+def _create_base_tables(conn: Connection) -> None:
+    for statement in _BASE_TABLES:
+        conn.execute(text(statement))
+    create_index(conn, "ix_species_id", "species", "id")
+    create_index(conn, "ix_bonsai_id", "bonsai", "id")
+
+
+def _add_bonsai_listing_indexes(conn: Connection) -> None:
+    create_index(conn, "ix_bonsai_status_created_at", "bonsai", "status", "created_at")
+    create_index(conn, "ix_bonsai_species_id_created_at", "bonsai", "species_id", "created_at")
+    create_index(
+        conn, "ix_bonsai_development_stage_created_at", "bonsai", "development_stage", "created_at"
+    )
+    create_index(conn, "ix_bonsai_location_created_at", "bonsai", "location", "created_at")
+    create_index(conn, "ix_bonsai_acquisition_date", "bonsai", "acquisition_date")
+    create_index(conn, "ix_bonsai_updated_at", "bonsai", "updated_at")
+
+
+def _add_child_table_indexes(conn: Connection) -> None:
+    # Databases created before measurements were linked to updates lack the column.
+    add_column(
+        conn,
+        "measurements",
+        "update_id",
+        "INTEGER REFERENCES bonsai_updates (id) ON DELETE SET NULL",
+    )
+    create_index(conn, "ix_photos_bonsai_id_created_at", "photos", "bonsai_id", "created_at")
+    create_index(
+        conn,
+        "ix_photos_bonsai_id_is_primary_created_at",
+        "photos",
+        "bonsai_id",
+        "is_primary",
+        "created_at",
+    )
+    create_index(conn, "ix_photos_update_id", "photos", "update_id")
+    create_index(
+        conn, "ix_measurements_bonsai_id_measured_at", "measurements", "bonsai_id", "measured_at"
+    )
+    create_index(conn, "ix_measurements_update_id", "measurements", "update_id")
+    create_index(
+        conn,
+        "ix_bonsai_updates_bonsai_id_performed_at",
+        "bonsai_updates",
+        "bonsai_id",
+        "performed_at",
+    )
+    create_index(
+        conn,
+        "ix_bonsai_updates_bonsai_id_latest",
+        "bonsai_updates",
+        "bonsai_id",
+        "coalesce(performed_at, created_at)",
+    )
+    create_index(conn, "ix_notifications_bonsai_id_due_at", "notifications", "bonsai_id", "due_at")
+    create_index(conn, "ix_notifications_read_due_at", "notifications", "read", "due_at")
+    create_index(conn, "ix_accolades_bonsai_id_created_at", "accolades", "bonsai_id", "created_at")
+
+
+def _add_graveyard_indexes(conn: Connection) -> None:
+    create_index(conn, "ix_graveyard_entries_moved_at", "graveyard_entries", "moved_at")
+    create_index(
+        conn,
+        "ix_graveyard_entries_category_moved_at",
+        "graveyard_entries",
+        "category",
+        "moved_at",
+    )
+
+
+def _add_photo_content_hash(conn: Connection) -> None:
+    add_column(conn, "photos", "content_hash", "VARCHAR(64)")
+    create_index(conn, "ix_photos_content_hash", "photos", "content_hash")
+    # Files are shared between photos, so deletes look up other references by path.
+    create_index(conn, "ix_photos_full_path", "photos", "full_path")
+    create_index(conn, "ix_photos_thumbnail_path", "photos", "thumbnail_path")
+
+
+def _add_photo_processing_state(conn: Connection) -> None:
+    add_column(conn, "photos", "processing_state", "VARCHAR(20) NOT NULL DEFAULT 'ready'")
+    create_index(
+        conn,
+        "ix_photos_processing_state_created_at",
+        "photos",
+        "processing_state",
+        "created_at",
+    )
+
+
+def _add_photo_image_metadata(conn: Connection) -> None:
+    # Existing rows are filled in by ``python -m app.photo_metadata``.
+    add_column(conn, "photos", "width", "INTEGER")
+    add_column(conn, "photos", "height", "INTEGER")
+    add_column(conn, "photos", "byte_size", "INTEGER")
+    add_column(conn, "photos", "dominant_color", "VARCHAR(7)")
+    add_column(conn, "photos", "blurhash", "VARCHAR(64)")
+
+
+def _add_bonsai_sort_indexes(conn: Connection) -> None:
+    # One index per summary sort key, ending in the id tiebreaker, so keyset
+    # pages seek and read in index order instead of sorting the table.
+    create_index(conn, "ix_bonsai_created_at_id", "bonsai", "created_at", "id")
+    create_index(conn, "ix_bonsai_name_id", "bonsai", "name", "id")
+    create_index(conn, "ix_bonsai_acquisition_date_id", "bonsai", "acquisition_date", "id")
+    conn.execute(text("DROP INDEX IF EXISTS ix_bonsai_acquisition_date"))
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "Create base tables", _create_base_tables),
+    Migration(2, "Index bonsai listing filters and sort keys", _add_bonsai_listing_indexes),
+    Migration(3, "Index child tables by bonsai and sort key", _add_child_table_indexes),
+    Migration(4, "Add full-text search index", create_search_index),
+    Migration(5, "Index graveyard listing by category and move date", _add_graveyard_indexes),
+    Migration(6, "Add photo content hashes for shared media files", _add_photo_content_hash),
+    Migration(7, "Track background processing state of photos", _add_photo_processing_state),
+    Migration(8, "Store photo dimensions, size and placeholders", _add_photo_image_metadata),
+    Migration(9, "Index bonsai summary sort keys with their id tiebreaker", _add_bonsai_sort_indexes),
+]
+
+
+def head_version() -> int:
+    return MIGRATIONS[-1].version
+
+
+def _ensure_version_table(conn: Connection) -> None:
+    conn.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {VERSION_TABLE} ("
+            "version INTEGER PRIMARY KEY, "
+            "description VARCHAR(255) NOT NULL, "
+            "applied_at DATETIME NOT NULL)"
+        )
+    )
+
+
+def current_version(bind: Engine = engine) -> int:
+    if not inspect(bind).has_table(VERSION_TABLE):
+        return 0
+    with bind.connect() as conn:
+        return conn.execute(text(f"SELECT MAX(version) FROM {VERSION_TABLE}")).scalar() or 0
+
+
+def upgrade(bind: Engine = engine, target: Optional[int] = None) -> list[Migration]:
+    """Apply pending migrations up to ``target`` (default: latest), one transaction each."""
+
+    target = head_version() if target is None else target
+    applied: list[Migration] = []
+    with bind.begin() as conn:
+        _ensure_version_table(conn)
+
+    version = current_version(bind)
+    for migration in MIGRATIONS:
+        if migration.version <= version or migration.version > target:
+            continue
+        with bind.begin() as conn:
+            migration.apply(conn)
+            conn.execute(
+                text(
+                    f"INSERT INTO {VERSION_TABLE} (version, description, applied_at) "
+                    "VALUES (:version, :description, :applied_at)"
+                ),
+                {
+                    "version": migration.version,
+                    "description": migration.description,
+                    "applied_at": datetime.utcnow(),
+                },
+            )
+        applied.append(migration)
+    return applied
+
+
+def ensure_current(bind: Engine = engine) -> None:
+    """Fail fast when the database has not been migrated to the version the code expects."""
+
+    version = current_version(bind)
+    if version < head_version():
+        raise RuntimeError(
+            f"Database schema is at version {version} but version {head_version()} is required. "
+            "Run `python -m app.migrations upgrade` from the backend directory first."
+        )
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Manage the bonsai database schema.")
+    subcommands = parser.add_subparsers(dest="command")
+    upgrade_parser = subcommands.add_parser("upgrade", help="Apply pending migrations (default).")
+    upgrade_parser.add_argument("--target", type=int, default=None, help="Stop at this version.")
+    subcommands.add_parser("current", help="Print the applied schema version.")
+    subcommands.add_parser("history", help="List known migrations.")
+    args = parser.parse_args(argv)
+
+    if args.command == "current":
+        print(f"{current_version()} (head: {head_version()})")
+    elif args.command == "history":
+        version = current_version()
+        for migration in MIGRATIONS:
+            marker = "x" if migration.version <= version else " "
+            print(f"[{marker}] {migration.version:>3}  {migration.description}")
+    else:
+        applied = upgrade(target=getattr(args, "target", None))
+        for migration in applied:
+            print(f"Applied {migration.version}: {migration.description}")
+        print(f"Schema is at version {current_version()}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,11 +9,14 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    event,
+    func,
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 
 from .database import Base
 
@@ -39,6 +42,16 @@ class Species(Base):
 
 class Bonsai(Base):
     __tablename__ = "bonsai"
+    __table_args__ = (
+        Index("ix_bonsai_status_created_at", "status", "created_at"),
+        Index("ix_bonsai_species_id_created_at", "species_id", "created_at"),
+        Index("ix_bonsai_development_stage_created_at", "development_stage", "created_at"),
+        Index("ix_bonsai_location_created_at", "location", "created_at"),
+        Index("ix_bonsai_updated_at", "updated_at"),
+        Index("ix_bonsai_created_at_id", "created_at", "id"),
+        Index("ix_bonsai_name_id", "name", "id"),
+        Index("ix_bonsai_acquisition_date_id", "acquisition_date", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -91,6 +104,9 @@ class Bonsai(Base):
 
 class BonsaiUpdate(Base):
     __tablename__ = "bonsai_updates"
+    __table_args__ = (
+        Index("ix_bonsai_updates_bonsai_id_performed_at", "bonsai_id", "performed_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     bonsai_id: Mapped[int] = mapped_column(Integer, ForeignKey("bonsai.id"), nullable=False)
@@ -116,6 +132,10 @@ class BonsaiUpdate(Base):
 
 class Measurement(Base):
     __tablename__ = "measurements"
+    __table_args__ = (
+        Index("ix_measurements_bonsai_id_measured_at", "bonsai_id", "measured_at"),
+        Index("ix_measurements_update_id", "update_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     bonsai_id: Mapped[int] = mapped_column(Integer, ForeignKey("bonsai.id"), nullable=False)
@@ -137,6 +157,15 @@ class Measurement(Base):
 
 class Photo(Base):
     __tablename__ = "photos"
+    __table_args__ = (
+        Index("ix_photos_bonsai_id_created_at", "bonsai_id", "created_at"),
+        Index("ix_photos_bonsai_id_is_primary_created_at", "bonsai_id", "is_primary", "created_at"),
+        Index("ix_photos_update_id", "update_id"),
+        Index("ix_photos_content_hash", "content_hash"),
+        Index("ix_photos_full_path", "full_path"),
+        Index("ix_photos_thumbnail_path", "thumbnail_path"),
+        Index("ix_photos_processing_state_created_at", "processing_state", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     bonsai_id: Mapped[int] = mapped_column(Integer, ForeignKey("bonsai.id"), nullable=False)
@@ -147,6 +176,20 @@ class Photo(Base):
     taken_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
     full_path: Mapped[str] = mapped_column(String(500), nullable=False)
     thumbnail_path: Mapped[str] = mapped_column(String(500), nullable=False)
+    # SHA-256 of the uploaded bytes; identical uploads share one set of files.
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64))
+    # "pending" and "processing" photos still point at the raw upload and have no
+    # thumbnail yet; "failed" ones are left for inspection (see app.photo_jobs).
+    processing_state: Mapped[str] = mapped_column(
+        String(20), default="ready", server_default="ready", nullable=False
+    )
+    # Measured at ingest so clients can reserve space and paint a placeholder
+    # before the image arrives; width and height are as displayed.
+    width: Mapped[Optional[int]] = mapped_column(Integer)
+    height: Mapped[Optional[int]] = mapped_column(Integer)
+    byte_size: Mapped[Optional[int]] = mapped_column(Integer)
+    dominant_color: Mapped[Optional[str]] = mapped_column(String(7))
+    blurhash: Mapped[Optional[str]] = mapped_column(String(64))
     is_primary: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False
@@ -158,6 +201,10 @@ class Photo(Base):
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_bonsai_id_due_at", "bonsai_id", "due_at"),
+        Index("ix_notifications_read_due_at", "read", "due_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     bonsai_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("bonsai.id"))
@@ -175,6 +222,10 @@ class Notification(Base):
 
 class GraveyardEntry(Base):
     __tablename__ = "graveyard_entries"
+    __table_args__ = (
+        Index("ix_graveyard_entries_moved_at", "moved_at"),
+        Index("ix_graveyard_entries_category_moved_at", "category", "moved_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     bonsai_id: Mapped[int] = mapped_column(Integer, ForeignKey("bonsai.id"), unique=True, nullable=False)
@@ -187,6 +238,7 @@ class GraveyardEntry(Base):
 
 class Accolade(Base):
     __tablename__ = "accolades"
+    __table_args__ = (Index("ix_accolades_bonsai_id_created_at", "bonsai_id", "created_at"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     bonsai_id: Mapped[int] = mapped_column(Integer, ForeignKey("bonsai.id"), nullable=False)
@@ -203,3 +255,42 @@ class Accolade(Base):
 
     bonsai: Mapped[Bonsai] = relationship("Bonsai", back_populates="accolades")
     photo: Mapped[Optional[Photo]] = relationship("Photo")
+
+
+# Serves the "latest update" lookup, which orders by performed_at falling back to created_at.
+Index(
+    "ix_bonsai_updates_bonsai_id_latest",
+    BonsaiUpdate.bonsai_id,
+    func.coalesce(BonsaiUpdate.performed_at, BonsaiUpdate.created_at),
+)
+
+
+BONSAI_CHILD_MODELS = (BonsaiUpdate, Measurement, Photo, Notification, GraveyardEntry, Accolade)
+
+
+@event.listens_for(Session, "before_flush")
+def _touch_parent_bonsai(session: Session, flush_context, instances) -> None:
+    """Bump ``Bonsai.updated_at`` whenever one of the tree's child rows changes.
+
+    Photos, notifications and graveyard entries carry no ``updated_at`` of their
+    own, so the parent timestamp is what change fingerprints (ETags) rely on.
+    """
+
+    created = {obj.id for obj in session.new if isinstance(obj, Bonsai)}
+    removed = {obj.id for obj in session.deleted if isinstance(obj, Bonsai)}
+    changed = [obj for obj in session.dirty if session.is_modified(obj)]
+
+    bonsai_ids = {
+        obj.bonsai_id
+        for obj in (*session.new, *changed, *session.deleted)
+        if isinstance(obj, BONSAI_CHILD_MODELS) and obj.bonsai_id
+    }
+    bonsai_ids -= created | removed
+    if not bonsai_ids:
+        return
+
+    now = datetime.utcnow()
+    for bonsai_id in bonsai_ids:
+        bonsai = session.get(Bonsai, bonsai_id)
+        if bonsai is not None:
+            bonsai.updated_at = now
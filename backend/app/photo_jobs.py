@@ -0,0 +1,160 @@
+"""Background processing of photos uploaded with ``defer_processing``.
+
+Deferred uploads are stored as-is under ``full/incoming/`` and their ``Photo``
+row starts out ``pending``. Workers started in the app lifespan decode, orient
+and thumbnail them in :data:`app.workers.image_pool`, then mark the row
+``ready`` (or ``failed``). The queue itself lives in memory; the database is
+the source of truth, so rows still ``pending`` or ``processing`` when the
+process stopped are queued again on the next start.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from . import models
+from .config import settings
+from .database import SessionLocal
+from .media_store import (
+    apply_stored_image,
+    find_stored_copy,
+    release_media,
+    resolve_media_path,
+    stored_image_of,
+)
+from .utils.images import StoredImage, save_image_file
+from .workers import PoolSaturatedError, image_pool
+
+logger = logging.getLogger(__name__)
+
+UNFINISHED_STATES = ("pending", "processing")
+
+# How long a worker waits before retrying when interactive uploads have every
+# pool slot; background jobs yield to them rather than failing.
+POOL_RETRY_SECONDS = 1.0
+
+
+def store_incoming(source: Path, content_hash: str, extension: str) -> str:
+    """Move a spooled upload into media storage and return its relative path."""
+
+    relative = f"full/incoming/{content_hash}{extension}"
+    destination = settings.media_root / relative
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    shutil.move(str(source), destination)
+    return relative
+
+
+class PhotoJobQueue:
+    """Process pending photos with a fixed number of asyncio workers."""
+
+    def __init__(self, concurrency: int) -> None:
+        self.concurrency = concurrency
+        self._queue: Optional[asyncio.Queue[int]] = None
+        self._tasks: list[asyncio.Task] = []
+        self.recovered = 0
+        self.processed = 0
+        self.failed = 0
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        with SessionLocal() as db:
+            unfinished = (
+                db.query(models.Photo.id)
+                .filter(models.Photo.processing_state.in_(UNFINISHED_STATES))
+                .order_by(models.Photo.created_at, models.Photo.id)
+                .all()
+            )
+        for (photo_id,) in unfinished:
+            self._queue.put_nowait(photo_id)
+        self.recovered = len(unfinished)
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        # Interrupted jobs keep their "processing" state and are retried on start.
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def enqueue(self, photo_id: int) -> None:
+        if self._queue is None:
+            # Not started (e.g. the app is running without its lifespan); the row
+            # stays pending and is picked up on the next start.
+            return
+        self._queue.put_nowait(photo_id)
+
+    async def _work(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            photo_id = await queue.get()
+            try:
+                await self._process(photo_id)
+                self.processed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.failed += 1
+                logger.exception("Processing photo %s failed", photo_id)
+                self._mark_failed(photo_id)
+            finally:
+                queue.task_done()
+
+    async def _process(self, photo_id: int) -> None:
+        with SessionLocal() as db:
+            photo = db.get(models.Photo, photo_id)
+            if photo is None or photo.processing_state not in UNFINISHED_STATES:
+                return
+            photo.processing_state = "processing"
+            db.commit()
+
+            incoming = photo.full_path
+            existing_copy = find_stored_copy(db, photo.content_hash)
+            if existing_copy is not None:
+                stored = stored_image_of(existing_copy)
+            else:
+                source = resolve_media_path(incoming)
+                if source is None or not source.is_file():
+                    raise FileNotFoundError(f"Upload for photo {photo_id} is missing")
+                stored = await self._save(source, photo.content_hash)
+
+            # The photo may have been deleted while the pool was busy with it.
+            db.expire_all()
+            photo = db.get(models.Photo, photo_id)
+            if photo is None:
+                release_media(db, stored.full_path, stored.thumbnail_path)
+                return
+            apply_stored_image(photo, stored)
+            photo.processing_state = "ready"
+            db.commit()
+            release_media(db, incoming, None)
+
+    async def _save(self, source: Path, content_hash: Optional[str]) -> StoredImage:
+        while True:
+            try:
+                return await image_pool.run(save_image_file, source, source.name, None, content_hash)
+            except PoolSaturatedError:
+                await asyncio.sleep(POOL_RETRY_SECONDS)
+
+    def _mark_failed(self, photo_id: int) -> None:
+        with SessionLocal() as db:
+            photo = db.get(models.Photo, photo_id)
+            if photo is not None:
+                photo.processing_state = "failed"
+                db.commit()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "recovered": self.recovered,
+            "processed": self.processed,
+            "failed": self.failed,
+        }
+
+
+photo_jobs = PhotoJobQueue(settings.image_workers)
@@ -0,0 +1,146 @@
+"""Backfill photo dimensions, file size and placeholders for existing rows.
+
+New uploads get these at ingest (see :class:`app.utils.images.StoredImage`);
+run ``python -m app.photo_metadata`` once after upgrading to fill in photos
+stored before that. Rows are walked in id order in batches and measured in a
+process pool. Only the full image's header is read; the placeholder comes
+from the thumbnail, so even large libraries finish quickly. The command can be
+interrupted and re-run: it only picks up rows that are still missing a width.
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from . import models
+from .database import SessionLocal
+from .utils.images import StoredImage, describe_stored_image
+
+BATCH_SIZE = 200
+
+
+@dataclass
+class BackfillReport:
+    updated: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+
+    @property
+    def photos_per_second(self) -> float:
+        return self.updated / self.seconds if self.seconds else 0.0
+
+
+def _measure(paths: tuple[str, str]) -> Optional[StoredImage]:
+    try:
+        return describe_stored_image(*paths)
+    except OSError:
+        return None
+
+
+def backfill(
+    db: Session,
+    executor: ProcessPoolExecutor,
+    *,
+    batch_size: int = BATCH_SIZE,
+) -> BackfillReport:
+    """Measure every ready photo that has no dimensions yet."""
+
+    report = BackfillReport()
+    started = time.perf_counter()
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(
+                models.Photo.id,
+                models.Photo.bonsai_id,
+                models.Photo.full_path,
+                models.Photo.thumbnail_path,
+            )
+            .where(
+                models.Photo.id > last_id,
+                models.Photo.width.is_(None),
+                models.Photo.processing_state == "ready",
+            )
+            .order_by(models.Photo.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        # Photos with the same content share files; measure each pair once.
+        unique_paths = list({(full_path, thumbnail_path or "") for *_, full_path, thumbnail_path in rows})
+        measured = dict(zip(unique_paths, executor.map(_measure, unique_paths)))
+
+        values = []
+        bonsai_ids = set()
+        for photo_id, bonsai_id, full_path, thumbnail_path in rows:
+            stored = measured[(full_path, thumbnail_path or "")]
+            if stored is None:
+                report.failed += 1
+                continue
+            values.append(
+                {
+                    "id": photo_id,
+                    **{
+                        key: value
+                        for key, value in asdict(stored).items()
+                        if key not in ("full_path", "thumbnail_path", "content_hash")
+                    },
+                }
+            )
+            bonsai_ids.add(bonsai_id)
+        if values:
+            db.execute(update(models.Photo), values)
+            # Bulk updates skip ``models._touch_parent_bonsai``; bump the trees
+            # so cached details and ETags pick up the new fields.
+            db.execute(
+                update(models.Bonsai)
+                .where(models.Bonsai.id.in_(bonsai_ids))
+                .values(updated_at=datetime.utcnow())
+            )
+            db.commit()
+        report.updated += len(values)
+
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def _get_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Fill in dimensions and placeholders for existing photos.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes measuring images in parallel (default: one per CPU).",
+    )
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Photos read and updated per batch.")
+    return parser
+
+
+def main() -> None:
+    args = _get_arg_parser().parse_args()
+    with ProcessPoolExecutor(
+        max_workers=max(args.workers, 1), mp_context=multiprocessing.get_context("spawn")
+    ) as executor, SessionLocal() as db:
+        report = backfill(db, executor, batch_size=max(args.batch_size, 1))
+
+    print(
+        f"Updated {report.updated} photos in {report.seconds:.1f}s "
+        f"({report.photos_per_second:.1f} photos/s)."
+    )
+    if report.failed:
+        print(f"{report.failed} photos could not be read; their files may be missing.")
+
+
+if __name__ == "__main__":
+    main()
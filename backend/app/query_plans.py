@@ -0,0 +1,180 @@
+"""Check that the hot per-tree queries are answered from indexes.
+
+Run ``python -m app.query_plans`` against a migrated database. Each query is
+explained with ``EXPLAIN QUERY PLAN`` and the command exits non-zero when any of
+them falls back to scanning a whole child table.
+"""
+from __future__ import annotations
+
+import re
+import sys
+from typing import Callable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from . import models
+from .database import engine
+from .routers.bonsai import _summary_query
+from .routers.notifications import _notifications_query
+
+CHILD_TABLES = (
+    "photos",
+    "measurements",
+    "bonsai_updates",
+    "notifications",
+    "accolades",
+    "graveyard_entries",
+)
+_FULL_SCAN = re.compile(rf"^SCAN ({'|'.join(CHILD_TABLES)})\b")
+
+SAMPLE_ID = 1
+SAMPLE_IDS = [1, 2, 3]
+
+
+def _detail_collections() -> list[tuple[str, Select]]:
+    # Mirrors the selectinload statements issued when a tree's detail is assembled.
+    return [
+        (
+            "detail photos",
+            select(models.Photo)
+            .where(models.Photo.bonsai_id.in_(SAMPLE_IDS))
+            .order_by(models.Photo.created_at.desc()),
+        ),
+        (
+            "detail updates",
+            select(models.BonsaiUpdate)
+            .where(models.BonsaiUpdate.bonsai_id.in_(SAMPLE_IDS))
+            .order_by(models.BonsaiUpdate.performed_at.desc()),
+        ),
+        (
+            "detail measurements",
+            select(models.Measurement)
+            .where(models.Measurement.bonsai_id.in_(SAMPLE_IDS))
+            .order_by(models.Measurement.measured_at.desc()),
+        ),
+        (
+            "update measurement",
+            select(models.Measurement).where(models.Measurement.update_id.in_(SAMPLE_IDS)),
+        ),
+        (
+            "detail notifications",
+            select(models.Notification)
+            .where(models.Notification.bonsai_id.in_(SAMPLE_IDS))
+            .order_by(models.Notification.due_at),
+        ),
+        (
+            "detail accolades",
+            select(models.Accolade)
+            .where(models.Accolade.bonsai_id.in_(SAMPLE_IDS))
+            .order_by(models.Accolade.created_at.desc()),
+        ),
+    ]
+
+
+def _child_listings() -> list[tuple[str, Select]]:
+    return [
+        (
+            "list measurements",
+            select(models.Measurement)
+            .where(models.Measurement.bonsai_id == SAMPLE_ID)
+            .order_by(models.Measurement.measured_at.desc()),
+        ),
+        (
+            "list updates",
+            select(models.BonsaiUpdate)
+            .where(models.BonsaiUpdate.bonsai_id == SAMPLE_ID)
+            .order_by(models.BonsaiUpdate.performed_at.desc()),
+        ),
+        (
+            "list photos",
+            select(models.Photo)
+            .where(models.Photo.bonsai_id == SAMPLE_ID)
+            .order_by(models.Photo.created_at.desc()),
+        ),
+        (
+            "list accolades",
+            select(models.Accolade)
+            .where(models.Accolade.bonsai_id == SAMPLE_ID)
+            .order_by(models.Accolade.created_at.desc()),
+        ),
+        (
+            "graveyard by category",
+            select(models.GraveyardEntry)
+            .where(models.GraveyardEntry.category == "dead")
+            .order_by(models.GraveyardEntry.moved_at.desc(), models.GraveyardEntry.id.desc()),
+        ),
+        (
+            "pending photo jobs",
+            select(models.Photo)
+            .where(models.Photo.processing_state.in_(["pending", "processing"]))
+            .order_by(models.Photo.created_at, models.Photo.id),
+        ),
+        (
+            "photos sharing a file",
+            select(models.Photo.id).where(models.Photo.full_path == "full/sample.jpg"),
+        ),
+        (
+            "tree photo count",
+            select(func.count(models.Photo.id)).where(models.Photo.bonsai_id == SAMPLE_ID),
+        ),
+    ]
+
+
+def hot_queries(session: Session) -> list[tuple[str, Select]]:
+    """Return the named statements whose plans are checked."""
+
+    summary = _summary_query(session).limit(50).statement
+    # The route's own query, so the checked SQL is exactly what it runs.
+    unread = _notifications_query(session, read=False).statement
+    return [
+        ("bonsai summary", summary),
+        *_detail_collections(),
+        *_child_listings(),
+        ("unread notifications", unread),
+    ]
+
+
+def explain(conn: Connection, statement: Select) -> list[str]:
+    compiled = statement.compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.construct_params()
+    positional = tuple(params[name] for name in compiled.positiontup or ())
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", positional).all()
+    return [row[-1] for row in rows]
+
+
+def full_scans(plan: list[str]) -> list[str]:
+    return [line for line in plan if _FULL_SCAN.match(line)]
+
+
+def check_query_plans(
+    bind: Engine = engine, report: Optional[Callable[[str], None]] = None
+) -> dict[str, list[str]]:
+    """Explain every hot query and return the full child-table scans found, by query name."""
+
+    problems: dict[str, list[str]] = {}
+    with bind.connect() as conn, Session(bind=conn) as session:
+        for name, statement in hot_queries(session):
+            plan = explain(conn, statement)
+            scans = full_scans(plan)
+            if scans:
+                problems[name] = scans
+            if report is not None:
+                report(f"{'FAIL' if scans else 'ok  '}  {name}")
+                for line in plan:
+                    report(f"        {line}")
+    return problems
+
+
+def main() -> None:
+    problems = check_query_plans(report=print)
+    if problems:
+        print(f"{len(problems)} quer{'y' if len(problems) == 1 else 'ies'} scan a whole child table.")
+        sys.exit(1)
+    print("All hot queries use an index.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Resized photo variants generated on demand and kept in a bounded disk cache."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Optional
+
+from .config import settings
+from .utils.images import write_thumbnail
+from .workers import image_pool
+
+
+class DiskLRUCache:
+    """Files under ``root`` capped at ``max_bytes``, evicting the least recently used.
+
+    Recency is tracked in memory and mirrored to each file's mtime, so the order
+    survives restarts: the index is rebuilt from a directory scan on first use.
+    """
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self._entries: Optional[OrderedDict[str, int]] = None
+        self._lock = Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _index(self) -> OrderedDict[str, int]:
+        if self._entries is None:
+            found = []
+            for path in self.root.rglob("*"):
+                if path.is_file() and not path.name.startswith("."):
+                    stat = path.stat()
+                    found.append((stat.st_mtime_ns, path.relative_to(self.root).as_posix(), stat.st_size))
+            found.sort()
+            self._entries = OrderedDict((key, size) for _, key, size in found)
+            self.total_bytes = sum(self._entries.values())
+        return self._entries
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key
+
+    def get(self, key: str) -> Optional[Path]:
+        with self._lock:
+            entries = self._index()
+            path = self.path_for(key)
+            if key not in entries or not path.exists():
+                if entries.pop(key, None) is not None:
+                    self.total_bytes = sum(entries.values())
+                self.misses += 1
+                return None
+            entries.move_to_end(key)
+            self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:  # pragma: no cover - evicted by another process
+            return None
+        return path
+
+    def add(self, key: str) -> None:
+        """Record a file already written to :meth:`path_for` and evict down to the cap."""
+
+        size = self.path_for(key).stat().st_size
+        with self._lock:
+            entries = self._index()
+            self.total_bytes += size - entries.pop(key, 0)
+            entries[key] = size
+            while self.total_bytes > self.max_bytes and len(entries) > 1:
+                victim, victim_size = entries.popitem(last=False)
+                self.total_bytes -= victim_size
+                self.evictions += 1
+                try:
+                    self.path_for(victim).unlink()
+                except OSError:  # pragma: no cover - already removed
+                    pass
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            entries = self._index()
+            return {
+                "entries": len(entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def _render(destination: Path, source: Path, width: int) -> None:
+    # Runs in a worker process; write to a temporary name so a half-written file
+    # is never served or indexed.
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    partial = destination.with_name(f".{destination.name}.{os.getpid()}.tmp")
+    try:
+        write_thumbnail(source, partial, box=(width, width * 4))
+        os.replace(partial, destination)
+    finally:
+        if partial.exists():
+            partial.unlink()
+
+
+class RenditionStore:
+    """Generate each cached variant once, however many requests race for it."""
+
+    def __init__(self, cache: DiskLRUCache) -> None:
+        self.cache = cache
+        self._pending: dict[str, asyncio.Task] = {}
+        self.generated = 0
+        self.deduplicated = 0
+
+    @staticmethod
+    def key_for(source: Path, width: int) -> str:
+        # The source's size and mtime are part of the key, so rotating a photo in
+        # place produces new variants instead of serving stale ones.
+        stat = source.stat()
+        digest = hashlib.sha1(f"{source}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()
+        return f"{width}/{digest}{source.suffix.lower()}"
+
+    async def get(self, source: Path, width: int) -> Path:
+        return await self.get_or_render(self.key_for(source, width), _render, source, width)
+
+    async def get_or_render(self, key: str, render: Callable[..., None], *args: Any) -> Path:
+        """Return the cached file for ``key``.
+
+        On a miss ``render(destination, *args)`` runs in the image pool and must
+        write the file atomically.
+        """
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        task = self._pending.get(key)
+        if task is None:
+            # Generation runs as its own task, so a client disconnecting does not
+            # cancel work that other requests for the same variant are waiting on.
+            task = asyncio.ensure_future(self._generate(key, render, args))
+            self._pending[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.deduplicated += 1
+        return await asyncio.shield(task)
+
+    async def _generate(self, key: str, render: Callable[..., None], args: tuple) -> Path:
+        destination = self.cache.path_for(key)
+        await image_pool.run(render, destination, *args)
+        self.cache.add(key)
+        self.generated += 1
+        return destination
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        self._pending.pop(key, None)
+        if not task.cancelled():
+            # Retrieve the exception so one nobody waited for is not logged as lost.
+            task.exception()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            **self.cache.stats(),
+            "generated": self.generated,
+            "deduplicated": self.deduplicated,
+            "in_progress": len(self._pending),
+        }
+
+
+renditions = RenditionStore(DiskLRUCache(settings.rendition_root, settings.rendition_cache_bytes))
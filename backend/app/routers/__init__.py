@@ -1,12 +1,31 @@
-from . import accolades, backup, bonsai, measurements, notifications, photos, species, updates
+from . import (
+    accolades,
+    admin,
+    backup,
+    bonsai,
+    measurements,
+    media,
+    metrics,
+    notifications,
+    photo_jobs,
+    photos,
+    search,
+    species,
+    updates,
+)
 
 __all__ = [
     "accolades",
+    "admin",
     "backup",
     "bonsai",
     "measurements",
+    "media",
+    "metrics",
     "notifications",
+    "photo_jobs",
     "photos",
+    "search",
     "species",
     "updates",
 ]
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session, selectinload
 from .. import models, schemas
 from ..config import settings
 from ..database import get_db
+from ..utils.serialization import json_response
 
 router = APIRouter(prefix=f"{settings.api_prefix}/bonsai", tags=["accolades"])
 
@@ -35,7 +36,10 @@ def list_accolades(bonsai_id: int, db: Session = Depends(get_db)):
         .order_by(models.Accolade.created_at.desc())
         .all()
     )
-    return [schemas.AccoladeOut.from_model(accolade) for accolade in accolades]
+    return json_response(
+        [schemas.AccoladeOut.from_model(accolade) for accolade in accolades],
+        list[schemas.AccoladeOut],
+    )
 
 
 @router.post(
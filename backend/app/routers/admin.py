@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import get_db
+from ..media_gc import collect_garbage
+
+router = APIRouter(prefix=f"{settings.api_prefix}/admin", tags=["admin"])
+
+
+@router.get("/media-gc")
+def report_orphaned_media(
+    grace_seconds: Optional[int] = Query(default=None, ge=0),
+    db: Session = Depends(get_db),
+):
+    """Report unreferenced media files and referenced files that are missing, without deleting."""
+
+    return collect_garbage(db, grace_seconds=grace_seconds).as_dict()
+
+
+@router.post("/media-gc")
+def delete_orphaned_media(
+    grace_seconds: Optional[int] = Query(default=None, ge=0),
+    db: Session = Depends(get_db),
+):
+    """Delete unreferenced media files older than the grace period and report what was removed."""
+
+    return collect_garbage(db, delete=True, grace_seconds=grace_seconds).as_dict()
@@ -16,8 +16,10 @@ from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session, selectinload
 
 from .. import models
+from ..cache import detail_cache
 from ..config import settings
 from ..database import get_db
+from ..search import rebuild_search_index, suspend_search_triggers
 
 router = APIRouter(prefix=f"{settings.api_prefix}/backup", tags=["backup"])
 
@@ -393,12 +395,14 @@ def _import_rows(
                 taken_at=_parse_datetime(row.get("taken_at")),
                 full_path=row.get("full_path") or "",
                 thumbnail_path=row.get("thumbnail_path") or "",
+                content_hash=row.get("content_hash") or None,
                 is_primary=_parse_bool(row.get("is_primary")) or False,
                 created_at=_parse_datetime(row.get("created_at")) or datetime.utcnow(),
             )
         )
 
     try:
+        suspend_search_triggers(db)
         db.query(models.Photo).delete(synchronize_session=False)
         db.query(models.Measurement).delete(synchronize_session=False)
         db.query(models.Notification).delete(synchronize_session=False)
@@ -414,6 +418,8 @@ def _import_rows(
         db.add_all(notification_objects)
         db.add_all(graveyard_objects)
         db.add_all(photo_objects)
+        db.flush()
+        rebuild_search_index(db)
         db.commit()
     except Exception as exc:  # pragma: no cover - defensive
         db.rollback()
@@ -479,6 +485,9 @@ def export_backup(db: Session = Depends(get_db)) -> StreamingResponse:
 
         tree_index_rows: list[dict[str, str]] = []
         media_root = settings.media_root
+        # Photos with identical content share files; each is archived once, under
+        # the first tree that references it, and import merges every tree's media.
+        archived_media: set[str] = set()
         for tree in bonsai:
             species = tree.species
             folder = f"{tree.id:04d}_{_slugify(tree.name)}"
@@ -611,6 +620,7 @@ def export_backup(db: Session = Depends(get_db)) -> StreamingResponse:
                     "taken_at",
                     "full_path",
                     "thumbnail_path",
+                    "content_hash",
                     "is_primary",
                     "update_id",
                     "update_title",
@@ -623,6 +633,7 @@ def export_backup(db: Session = Depends(get_db)) -> StreamingResponse:
                         "taken_at": _iso_datetime(photo.taken_at),
                         "full_path": photo.full_path,
                         "thumbnail_path": photo.thumbnail_path,
+                        "content_hash": photo.content_hash or "",
                         "is_primary": _bool_to_str(photo.is_primary),
                         "update_id": photo.update_id or "",
                         "update_title": update_titles.get(photo.update_id, ""),
@@ -653,6 +664,11 @@ def export_backup(db: Session = Depends(get_db)) -> StreamingResponse:
                     if not source_path.exists() or not source_path.is_file():
                         continue
 
+                    media_key = f"{prefix}/{subpath.as_posix()}"
+                    if media_key in archived_media:
+                        continue
+                    archived_media.add(media_key)
+
                     destination = tree_media_dir / prefix / subpath
                     archive.write(source_path, destination.as_posix())
 
@@ -933,6 +949,7 @@ def export_single_bonsai(bonsai_id: int, db: Session = Depends(get_db)) -> Strea
                 "taken_at",
                 "full_path",
                 "thumbnail_path",
+                "content_hash",
                 "is_primary",
                 "update_id",
                 "update_title",
@@ -945,6 +962,7 @@ def export_single_bonsai(bonsai_id: int, db: Session = Depends(get_db)) -> Strea
                     "taken_at": _iso_datetime(photo.taken_at),
                     "full_path": photo.full_path,
                     "thumbnail_path": photo.thumbnail_path,
+                    "content_hash": photo.content_hash or "",
                     "is_primary": _bool_to_str(photo.is_primary),
                     "update_id": photo.update_id or "",
                     "update_title": update_titles.get(photo.update_id, ""),
@@ -956,6 +974,7 @@ def export_single_bonsai(bonsai_id: int, db: Session = Depends(get_db)) -> Strea
 
         media_root = settings.media_root
         tree_media_dir = Path(tree_dir) / "photos"
+        archived_media: set[str] = set()
         for photo in photos:
             for path_value, prefix in (
                 (photo.full_path, "full"),
@@ -976,6 +995,11 @@ def export_single_bonsai(bonsai_id: int, db: Session = Depends(get_db)) -> Strea
                 if not source_path.exists() or not source_path.is_file():
                     continue
 
+                media_key = f"{prefix}/{subpath.as_posix()}"
+                if media_key in archived_media:
+                    continue
+                archived_media.add(media_key)
+
                 destination = tree_media_dir / prefix / subpath
                 archive.write(source_path, destination.as_posix())
 
@@ -1165,9 +1189,12 @@ async def import_backup(
 ):
     """Import bonsai data and media from a ZIP archive."""
 
-    content = await file.read()
+    # The multipart parser has already spooled the upload to a temporary file on
+    # disk (its size capped by UploadSizeLimitMiddleware); read the archive from
+    # there instead of loading it into memory.
+    await file.seek(0)
     try:
-        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        with zipfile.ZipFile(file.file) as archive:
             namelist = set(archive.namelist())
             metadata_version = "1.0"
             if "metadata.json" in namelist:
@@ -1242,6 +1269,8 @@ async def import_backup(
                 )
 
                 _restore_media(tmp_dir, metadata_version)
+                # The import replaces rows with bulk deletes that skip the ORM hooks.
+                detail_cache.clear()
     except zipfile.BadZipFile as exc:  # pragma: no cover - defensive programming
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid ZIP archive") from exc
 
@@ -1,27 +1,72 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, selectinload
+from dataclasses import asdict
+from datetime import date, datetime
+from typing import Any, Iterable, Optional, Sequence
+
+from fastapi import APIRouter, Depends, HTTPException, Query as QueryParam, Request, status
+from sqlalchemy import func, select
+from sqlalchemy.orm import Query, Session, contains_eager, joinedload, load_only, selectinload
 
 from .. import models, schemas
+from ..cache import detail_cache
 from ..config import settings
 from ..database import get_db
+from ..media_store import release_media
+from ..sprites import ensure_sprite, plan_sprite
+from ..utils.http_cache import etag_matches, make_etag, not_modified, validator_headers
+from ..utils.pagination import decode_cursor, encode_cursor, keyset_after, keyset_order
+from ..utils.serialization import json_response
+from ..workers import PoolSaturatedError
 
 router = APIRouter(prefix=f"{settings.api_prefix}/bonsai", tags=["bonsai"])
 
 
-def _load_bonsai(db: Session, bonsai_id: int) -> models.Bonsai:
+DETAIL_COLLECTIONS = ("photos", "updates", "measurements", "notifications", "accolades")
+SUMMARY_FIELDS = tuple(name for name in schemas.BonsaiSummary.model_fields if name != "id")
+LATEST_FIELDS = ("primary_photo", "latest_measurement", "latest_update")
+
+_COLLECTION_LOADERS = {
+    "photos": selectinload(models.Bonsai.photos),
+    "measurements": selectinload(models.Bonsai.measurements),
+    "updates": selectinload(models.Bonsai.updates).selectinload(models.BonsaiUpdate.measurement),
+    "notifications": selectinload(models.Bonsai.notifications),
+    "accolades": selectinload(models.Bonsai.accolades).selectinload(models.Accolade.photo),
+}
+
+
+def _load_bonsai(
+    db: Session,
+    bonsai_id: int,
+    *,
+    include: Iterable[str] = DETAIL_COLLECTIONS,
+    fields: Optional[Iterable[str]] = None,
+) -> models.Bonsai:
+    """Load a tree with the requested collections.
+
+    ``fields`` restricts the ``bonsai`` columns and to-one relationships that are
+    loaded; ``None`` loads everything.
+    """
+
+    options = [_COLLECTION_LOADERS[name] for name in include]
+    if fields is None:
+        options.extend(
+            [selectinload(models.Bonsai.species), selectinload(models.Bonsai.graveyard_entry)]
+        )
+    else:
+        fields = set(fields)
+        columns = [
+            getattr(models.Bonsai, name) for name in fields if name in models.Bonsai.__table__.c
+        ]
+        options.append(load_only(models.Bonsai.id, *columns))
+        if "species" in fields:
+            options.append(selectinload(models.Bonsai.species))
+        if "graveyard_entry" in fields:
+            options.append(selectinload(models.Bonsai.graveyard_entry))
+
     bonsai = (
         db.query(models.Bonsai)
-        .options(
-            selectinload(models.Bonsai.species),
-            selectinload(models.Bonsai.photos),
-            selectinload(models.Bonsai.measurements),
-            selectinload(models.Bonsai.updates).selectinload(models.BonsaiUpdate.measurement),
-            selectinload(models.Bonsai.notifications),
-            selectinload(models.Bonsai.graveyard_entry),
-            selectinload(models.Bonsai.accolades).selectinload(models.Accolade.photo),
-        )
+        .options(*options)
         .filter(models.Bonsai.id == bonsai_id)
         .first()
     )
@@ -30,8 +75,315 @@ def _load_bonsai(db: Session, bonsai_id: int) -> models.Bonsai:
     return bonsai
 
 
+def _parse_selection(value: Optional[str], allowed: Sequence[str], parameter: str) -> Optional[set[str]]:
+    if value is None:
+        return None
+    selected = {item.strip() for item in value.split(",") if item.strip()}
+    unknown = selected - set(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported {parameter} value(s): {', '.join(sorted(unknown))}",
+        )
+    return selected
+
+
+def _sparse_bonsai_detail(
+    db: Session, bonsai_id: int, fields: Optional[set[str]], include: set[str]
+) -> dict[str, Any]:
+    """Serialize only the requested parts of a tree.
+
+    The primary photo and latest measurement/update are picked in SQL, so asking
+    for them does not load the photo, measurement or update history.
+    """
+
+    selected_fields = set(SUMMARY_FIELDS) if fields is None else fields
+    bonsai = _load_bonsai(db, bonsai_id, include=include, fields=selected_fields)
+
+    payload: dict[str, Any] = {"id": bonsai.id}
+    for name in selected_fields - {"species", "graveyard_entry", *LATEST_FIELDS}:
+        payload[name] = getattr(bonsai, name)
+    if "species" in selected_fields:
+        payload["species"] = schemas.SpeciesOut.from_row(bonsai.species) if bonsai.species else None
+    if "graveyard_entry" in selected_fields:
+        payload["graveyard_entry"] = (
+            schemas.GraveyardEntryOut.from_row(bonsai.graveyard_entry)
+            if bonsai.graveyard_entry
+            else None
+        )
+
+    if selected_fields & set(LATEST_FIELDS):
+        photo, measurement, update = (
+            _with_latest_rows(
+                db.query(models.Photo, models.Measurement, models.BonsaiUpdate).select_from(
+                    models.Bonsai
+                )
+            )
+            .options(selectinload(models.BonsaiUpdate.measurement))
+            .filter(models.Bonsai.id == bonsai_id)
+            .one()
+        )
+        latest = {
+            "primary_photo": schemas.PhotoOut.from_model(photo) if photo else None,
+            "latest_measurement": schemas.MeasurementOut.from_row(measurement) if measurement else None,
+            "latest_update": schemas.BonsaiUpdateOut.from_row(update) if update else None,
+        }
+        payload.update({name: latest[name] for name in LATEST_FIELDS if name in selected_fields})
+
+    if "photos" in include:
+        payload["photos"] = [schemas.PhotoOut.from_model(photo) for photo in bonsai.photos]
+    if "updates" in include:
+        payload["updates"] = [schemas.BonsaiUpdateOut.from_row(update) for update in bonsai.updates]
+    if "measurements" in include:
+        payload["measurements"] = [
+            schemas.MeasurementOut.from_row(measurement) for measurement in bonsai.measurements
+        ]
+    if "notifications" in include:
+        payload["notifications"] = [
+            schemas.NotificationOut.from_row(notification) for notification in bonsai.notifications
+        ]
+    if "accolades" in include:
+        payload["accolades"] = [
+            schemas.AccoladeOut.from_model(accolade) for accolade in bonsai.accolades
+        ]
+    return payload
+
+
+def _bonsai_fingerprint(db: Session, bonsai_id: int) -> Optional[tuple]:
+    """Return a cheap change fingerprint for one tree, or ``None`` if it does not exist.
+
+    Child writes bump ``Bonsai.updated_at`` (see ``models._touch_parent_bonsai``);
+    the per-table row counts and timestamps guard against writes that bypass the ORM.
+    """
+
+    child_counts = [
+        select(func.count())
+        .select_from(model)
+        .where(model.bonsai_id == models.Bonsai.id)
+        .correlate(models.Bonsai)
+        .scalar_subquery()
+        for model in (
+            models.Photo,
+            models.Measurement,
+            models.BonsaiUpdate,
+            models.Notification,
+            models.Accolade,
+        )
+    ]
+    child_changes = [
+        select(func.max(model.updated_at))
+        .where(model.bonsai_id == models.Bonsai.id)
+        .correlate(models.Bonsai)
+        .scalar_subquery()
+        for model in (models.BonsaiUpdate, models.Accolade)
+    ]
+    row = (
+        db.query(models.Bonsai.updated_at, models.Species.updated_at, *child_counts, *child_changes)
+        .outerjoin(models.Bonsai.species)
+        .filter(models.Bonsai.id == bonsai_id)
+        .first()
+    )
+    return tuple(row) if row else None
+
+
+def _collection_fingerprint(db: Session) -> tuple:
+    bonsai_state = db.query(func.max(models.Bonsai.updated_at), func.count(models.Bonsai.id)).one()
+    species_state = db.query(func.max(models.Species.updated_at), func.count(models.Species.id)).one()
+    return (*bonsai_state, *species_state)
+
+
+def _primary_photo_id():
+    return (
+        select(models.Photo.id)
+        .where(models.Photo.bonsai_id == models.Bonsai.id, models.Photo.processing_state == "ready")
+        .order_by(models.Photo.is_primary.desc(), models.Photo.created_at.desc())
+        .limit(1)
+        .correlate(models.Bonsai)
+        .scalar_subquery()
+    )
+
+
+def _latest_measurement_id():
+    return (
+        select(models.Measurement.id)
+        .where(models.Measurement.bonsai_id == models.Bonsai.id)
+        .order_by(models.Measurement.measured_at.desc())
+        .limit(1)
+        .correlate(models.Bonsai)
+        .scalar_subquery()
+    )
+
+
+def _latest_update_id():
+    return (
+        select(models.BonsaiUpdate.id)
+        .where(models.BonsaiUpdate.bonsai_id == models.Bonsai.id)
+        .order_by(
+            func.coalesce(models.BonsaiUpdate.performed_at, models.BonsaiUpdate.created_at).desc()
+        )
+        .limit(1)
+        .correlate(models.Bonsai)
+        .scalar_subquery()
+    )
+
+
+def _with_latest_rows(query: Query) -> Query:
+    """Join each tree's primary photo, latest measurement and latest update.
+
+    The related rows are picked by correlated subqueries so the database returns a
+    single row per tree and none of the child collections are loaded.
+    """
+
+    return (
+        query.outerjoin(models.Photo, models.Photo.id == _primary_photo_id())
+        .outerjoin(models.Measurement, models.Measurement.id == _latest_measurement_id())
+        .outerjoin(models.BonsaiUpdate, models.BonsaiUpdate.id == _latest_update_id())
+    )
+
+
+def _summary_query(db: Session) -> Query:
+    return (
+        _with_latest_rows(
+            db.query(models.Bonsai, models.Photo, models.Measurement, models.BonsaiUpdate)
+            .outerjoin(models.Bonsai.species)
+        )
+        .options(
+            contains_eager(models.Bonsai.species),
+            joinedload(models.Bonsai.graveyard_entry),
+            selectinload(models.BonsaiUpdate.measurement),
+        )
+    )
+
+
+SORT_COLUMNS = {
+    "created_at": models.Bonsai.created_at,
+    "name": models.Bonsai.name,
+    "acquisition_date": models.Bonsai.acquisition_date,
+}
+
+
+def _parse_sort(sort: str) -> tuple[str, bool]:
+    descending = sort.startswith("-")
+    key = sort.lstrip("-")
+    if key not in SORT_COLUMNS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported sort key. Use one of: {', '.join(SORT_COLUMNS)}",
+        )
+    return key, descending
+
+
+def _encode_position(sort: str, direction: str, bonsai: models.Bonsai, key: str) -> str:
+    value = getattr(bonsai, key)
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    return encode_cursor({"sort": sort, "dir": direction, "key": [value, bonsai.id]})
+
+
+def _decode_position(cursor: str, sort: str, key: str) -> tuple[str, Any, int]:
+    try:
+        payload = decode_cursor(cursor)
+        if payload.get("sort") != sort:
+            raise ValueError("Cursor does not match the requested sort order")
+        direction = payload["dir"]
+        value, bonsai_id = payload["key"]
+        if direction not in {"next", "prev"}:
+            raise ValueError("Invalid cursor direction")
+        if value is not None and key == "created_at":
+            value = datetime.fromisoformat(value)
+        elif value is not None and key == "acquisition_date":
+            value = date.fromisoformat(value)
+        return direction, value, int(bonsai_id)
+    except (KeyError, TypeError, ValueError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+
+def _paginate_summaries(
+    query: Query, sort: str, limit: int, cursor: Optional[str]
+) -> schemas.BonsaiSummaryPage:
+    """Return one keyset page of ``query`` ordered by ``sort`` and ``Bonsai.id``.
+
+    Each page seeks directly to its position using the sort key of the first or
+    last row of the neighbouring page, so deep pages cost the same as the first.
+    """
+
+    key, descending = _parse_sort(sort)
+    column = SORT_COLUMNS[key]
+    direction = "next"
+
+    if cursor:
+        direction, value, bonsai_id = _decode_position(cursor, sort, key)
+        # Walking backwards flips the ordering; the rows are reversed again below.
+        scan_descending = descending if direction == "next" else not descending
+        query = query.filter(
+            keyset_after(column, models.Bonsai.id, value, bonsai_id, descending=scan_descending)
+        )
+    else:
+        scan_descending = descending
+
+    rows = (
+        query.order_by(*keyset_order(column, models.Bonsai.id, descending=scan_descending))
+        .limit(limit + 1)
+        .all()
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if direction == "prev":
+        rows.reverse()
+
+    items = [
+        schemas.BonsaiSummary.from_parts(bonsai, photo, measurement, update)
+        for bonsai, photo, measurement, update in rows
+    ]
+    if not rows:
+        return schemas.BonsaiSummaryPage.model_construct(items=items, next_cursor=None, prev_cursor=None)
+
+    first, last = rows[0][0], rows[-1][0]
+    has_next = has_more if direction == "next" else True
+    has_prev = bool(cursor) if direction == "next" else has_more
+    return schemas.BonsaiSummaryPage.model_construct(
+        items=items,
+        next_cursor=_encode_position(sort, "next", last, key) if has_next else None,
+        prev_cursor=_encode_position(sort, "prev", first, key) if has_prev else None,
+    )
+
+
+def _bonsai_filters(
+    status_filter: Optional[str] = QueryParam(default=None, alias="status"),
+    species_id: Optional[int] = None,
+    development_stage: Optional[str] = None,
+    location: Optional[str] = None,
+    acquired_from: Optional[date] = None,
+    acquired_to: Optional[date] = None,
+) -> list:
+    """Translate list query parameters into filters on the indexed ``bonsai`` columns."""
+
+    criteria = []
+    if status_filter is not None:
+        criteria.append(models.Bonsai.status == status_filter)
+    if species_id is not None:
+        criteria.append(models.Bonsai.species_id == species_id)
+    if development_stage is not None:
+        criteria.append(models.Bonsai.development_stage == development_stage)
+    if location is not None:
+        criteria.append(models.Bonsai.location == location)
+    if acquired_from is not None:
+        criteria.append(models.Bonsai.acquisition_date >= acquired_from)
+    if acquired_to is not None:
+        criteria.append(models.Bonsai.acquisition_date <= acquired_to)
+    return criteria
+
+
 @router.get("/", response_model=list[schemas.BonsaiDetail])
-def list_bonsai(db: Session = Depends(get_db)):
+def list_bonsai(
+    request: Request,
+    filters: list = Depends(_bonsai_filters),
+    db: Session = Depends(get_db),
+):
+    etag = make_etag("bonsai-list", request.url.query, *_collection_fingerprint(db))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     bonsai_list = (
         db.query(models.Bonsai)
         .options(
@@ -43,10 +395,95 @@ def list_bonsai(db: Session = Depends(get_db)):
             selectinload(models.Bonsai.graveyard_entry),
             selectinload(models.Bonsai.accolades).selectinload(models.Accolade.photo),
         )
+        .filter(*filters)
         .order_by(models.Bonsai.created_at.desc())
         .all()
     )
-    return [schemas.BonsaiDetail.from_model(bonsai) for bonsai in bonsai_list]
+    return json_response(
+        [schemas.BonsaiDetail.from_model(bonsai) for bonsai in bonsai_list],
+        list[schemas.BonsaiDetail],
+        headers=validator_headers(etag),
+    )
+
+
+@router.get("/summary", response_model=schemas.BonsaiSummaryPage)
+def list_bonsai_summaries(
+    request: Request,
+    sort: str = QueryParam(default="-created_at"),
+    limit: int = QueryParam(default=50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    filters: list = Depends(_bonsai_filters),
+    db: Session = Depends(get_db),
+):
+    etag = make_etag("bonsai-summary", request.url.query, *_collection_fingerprint(db))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    page = _paginate_summaries(_summary_query(db).filter(*filters), sort, limit, cursor)
+    return json_response(page, schemas.BonsaiSummaryPage, headers=validator_headers(etag))
+
+
+def _parse_ids(value: str) -> list[int]:
+    try:
+        ids = list(dict.fromkeys(int(item) for item in value.split(",") if item.strip()))
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers",
+        ) from exc
+    return ids
+
+
+@router.get("/summary/sprite", response_model=schemas.SpriteSheet)
+async def get_summary_sprite(
+    request: Request,
+    ids: str = QueryParam(..., description="Comma-separated bonsai ids, usually one summary page"),
+    db: Session = Depends(get_db),
+):
+    """Primary thumbnails of the given trees as one contact-sheet image.
+
+    The response maps each tree to the square tile holding its primary photo;
+    ``url`` is immutable, so a page of cards costs one image fetch. Trees
+    without a processed photo are left out.
+    """
+
+    bonsai_ids = _parse_ids(ids)
+    if len(bonsai_ids) > settings.max_sprite_tiles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A sprite may hold at most {settings.max_sprite_tiles} trees.",
+        )
+
+    rows = (
+        db.query(models.Bonsai.id, models.Photo.id, models.Photo.thumbnail_path)
+        .join(models.Photo, models.Photo.id == _primary_photo_id())
+        .filter(models.Bonsai.id.in_(bonsai_ids), models.Photo.processing_state == "ready")
+        .all()
+    )
+    plan = plan_sprite(rows)
+    if plan is None:
+        return json_response(schemas.SpriteSheet(), schemas.SpriteSheet)
+
+    try:
+        # Generated before answering, even with 304, so the URL always resolves.
+        await ensure_sprite(plan)
+    except PoolSaturatedError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many photos are being processed; try again shortly.",
+            headers={"Retry-After": "5"},
+        ) from exc
+
+    etag = make_etag("bonsai-sprite", plan.name)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    sheet = schemas.SpriteSheet(
+        url=f"{settings.media_url.rstrip('/')}/{plan.key}",
+        width=plan.width,
+        height=plan.height,
+        tiles=[schemas.SpriteTile(**asdict(tile)) for tile in plan.tiles],
+    )
+    return json_response(sheet, schemas.SpriteSheet, headers=validator_headers(etag))
 
 
 @router.post("/", response_model=schemas.BonsaiDetail, status_code=status.HTTP_201_CREATED)
@@ -65,16 +502,118 @@ def create_bonsai(payload: schemas.BonsaiCreate, db: Session = Depends(get_db)):
     return schemas.BonsaiDetail.from_model(_load_bonsai(db, bonsai.id))
 
 
-@router.get("/graveyard", response_model=list[schemas.GraveyardEntryOut])
-def list_graveyard_entries(db: Session = Depends(get_db)):
-    entries = db.query(models.GraveyardEntry).options(selectinload(models.GraveyardEntry.bonsai)).all()
-    return [schemas.GraveyardEntryOut.model_validate(entry) for entry in entries]
+@router.get("/graveyard", response_model=schemas.GraveyardPage)
+def list_graveyard_entries(
+    category: Optional[str] = None,
+    limit: int = QueryParam(default=50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """Page through the graveyard, most recently moved first.
+
+    Each entry carries its tree's name, species and primary thumbnail, all read
+    in the same query.
+    """
+
+    entry = models.GraveyardEntry
+    query = (
+        db.query(
+            entry.id,
+            entry.bonsai_id,
+            entry.category,
+            entry.note,
+            entry.moved_at,
+            models.Bonsai.name.label("bonsai_name"),
+            models.Species.common_name.label("species_name"),
+            models.Photo.thumbnail_path,
+        )
+        .join(models.Bonsai, models.Bonsai.id == entry.bonsai_id)
+        .outerjoin(models.Species, models.Species.id == models.Bonsai.species_id)
+        .outerjoin(models.Photo, models.Photo.id == _primary_photo_id())
+    )
+    if category is not None:
+        query = query.filter(entry.category == category)
+    if cursor:
+        try:
+            payload = decode_cursor(cursor)
+            if payload.get("category") != category:
+                raise ValueError("Cursor does not match the requested category")
+            moved_at, entry_id = payload["key"]
+            position = (datetime.fromisoformat(moved_at), int(entry_id))
+        except (KeyError, TypeError, ValueError) as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+        query = query.filter(keyset_after(entry.moved_at, entry.id, *position, descending=True))
+
+    rows = (
+        query.order_by(*keyset_order(entry.moved_at, entry.id, descending=True))
+        .limit(limit + 1)
+        .all()
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(
+            {"category": category, "key": [rows[-1].moved_at.isoformat(), rows[-1].id]}
+        )
+
+    base_url = settings.media_url.rstrip("/")
+    items = [
+        schemas.GraveyardListItem.model_construct(
+            id=row.id,
+            bonsai_id=row.bonsai_id,
+            category=row.category,
+            note=row.note,
+            moved_at=row.moved_at,
+            bonsai_name=row.bonsai_name,
+            species_name=row.species_name,
+            thumbnail_url=f"{base_url}/{row.thumbnail_path}" if row.thumbnail_path else None,
+        )
+        for row in rows
+    ]
+    return json_response(
+        schemas.GraveyardPage.model_construct(items=items, next_cursor=next_cursor),
+        schemas.GraveyardPage,
+    )
 
 
 @router.get("/{bonsai_id}", response_model=schemas.BonsaiDetail)
-def get_bonsai(bonsai_id: int, db: Session = Depends(get_db)):
-    bonsai = _load_bonsai(db, bonsai_id)
-    return schemas.BonsaiDetail.from_model(bonsai)
+def get_bonsai(
+    bonsai_id: int,
+    request: Request,
+    fields: Optional[str] = QueryParam(
+        default=None, description="Comma-separated summary fields to return; id is always included."
+    ),
+    include: Optional[str] = QueryParam(
+        default=None, description="Comma-separated collections to expand; omit for all of them."
+    ),
+    db: Session = Depends(get_db),
+):
+    selected_fields = _parse_selection(fields, SUMMARY_FIELDS, "fields")
+    included = _parse_selection(include, DETAIL_COLLECTIONS, "include")
+
+    fingerprint = _bonsai_fingerprint(db, bonsai_id)
+    if fingerprint is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Bonsai not found")
+
+    etag = make_etag("bonsai", bonsai_id, request.url.query, *fingerprint)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    detail = detail_cache.get(bonsai_id, version=fingerprint)
+
+    if selected_fields is not None or included is not None:
+        included = set(DETAIL_COLLECTIONS) if included is None else included
+        if detail is None:
+            payload = _sparse_bonsai_detail(db, bonsai_id, selected_fields, included)
+        else:
+            keys = set(SUMMARY_FIELDS if selected_fields is None else selected_fields) | included
+            payload = {"id": detail.id, **{name: getattr(detail, name) for name in keys}}
+        return json_response(payload, dict[str, Any], headers=validator_headers(etag))
+
+    if detail is None:
+        detail = schemas.BonsaiDetail.from_model(_load_bonsai(db, bonsai_id))
+        detail_cache.set(bonsai_id, detail, version=fingerprint)
+    return json_response(detail, schemas.BonsaiDetail, headers=validator_headers(etag))
 
 
 @router.patch("/{bonsai_id}", response_model=schemas.BonsaiDetail)
@@ -159,5 +698,16 @@ def delete_bonsai(bonsai_id: int, db: Session = Depends(get_db)):
             species.tree_count = max(0, species.tree_count - 1)
             db.add(species)
 
+    # Photo rows go with the tree; their files are released once they are gone,
+    # keeping any that other trees' photos share.
+    photo_paths = (
+        db.query(models.Photo.full_path, models.Photo.thumbnail_path)
+        .filter(models.Photo.bonsai_id == bonsai_id)
+        .distinct()
+        .all()
+    )
     db.delete(bonsai)
     db.commit()
+
+    for full_path, thumbnail_path in photo_paths:
+        release_media(db, full_path, thumbnail_path)
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 from .. import models, schemas
 from ..config import settings
 from ..database import get_db
+from ..utils.serialization import json_response
 
 router = APIRouter(prefix=f"{settings.api_prefix}/bonsai", tags=["measurements"])
 
@@ -53,12 +54,16 @@ def list_measurements(bonsai_id: int, db: Session = Depends(get_db)):
     if not bonsai:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Bonsai not found")
 
-    return (
+    measurements = (
         db.query(models.Measurement)
         .filter(models.Measurement.bonsai_id == bonsai_id)
         .order_by(models.Measurement.measured_at.desc())
         .all()
     )
+    return json_response(
+        [schemas.MeasurementOut.from_row(measurement) for measurement in measurements],
+        list[schemas.MeasurementOut],
+    )
 
 
 @router.delete(
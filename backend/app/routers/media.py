@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import mimetypes
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..config import settings
+from ..database import get_db
+from ..media_store import resolve_media_path
+from ..renditions import renditions
+from ..sprites import cached_sprite
+from ..utils.http_cache import accepted_media_types
+from ..utils.images import DERIVATIVE_FORMATS, derivative_formats, derivative_path
+from ..utils.static import REVALIDATE_CACHE_CONTROL, media_file_response
+from ..workers import PoolSaturatedError
+
+# Mounted under the media URL so renditions sit next to the static files; the
+# app includes this router before mounting StaticFiles so these routes win.
+router = APIRouter(prefix=settings.media_url.rstrip("/"), tags=["media"])
+
+
+@router.get("/r/{width}/{photo_id}")
+async def get_rendition(width: int, photo_id: int, request: Request, db: Session = Depends(get_db)):
+    """Serve ``photo_id`` scaled to at most ``width`` pixels wide.
+
+    Widths are limited to ``settings.rendition_widths``. Variants are generated
+    on first request and kept in a size-bounded disk cache. The URL names the
+    photo rather than a file version, so clients revalidate with the ETag.
+    """
+
+    if width not in settings.rendition_widths:
+        allowed = ", ".join(str(value) for value in sorted(settings.rendition_widths))
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unsupported rendition width; use one of {allowed}",
+        )
+
+    photo = db.get(models.Photo, photo_id)
+    source = resolve_media_path(photo.full_path) if photo else None
+    if source is None or not source.is_file():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found")
+
+    try:
+        path = await renditions.get(source, width)
+    except PoolSaturatedError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many photos are being processed; try again shortly.",
+            headers={"Retry-After": "5"},
+        ) from exc
+
+    media_type, _ = mimetypes.guess_type(path.name)
+    return media_file_response(
+        request.headers, path, media_type=media_type, cache_control=REVALIDATE_CACHE_CONTROL
+    )
+
+
+@router.get("/thumbs/{name}")
+def get_thumbnail(name: str, request: Request):
+    """Serve a thumbnail in the best format the client's ``Accept`` header allows.
+
+    AVIF and WebP derivatives are preferred when they exist and the client lists
+    their media type; otherwise the thumbnail is served in its original format.
+    """
+
+    if name.startswith(".") or "/" in name or "\\" in name:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    original = settings.media_root / "thumbs" / name
+    if not original.is_file():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    headers = {"Vary": "Accept"}
+    accepted = accepted_media_types(request)
+    for extension in derivative_formats():
+        _, media_type, _ = DERIVATIVE_FORMATS[extension]
+        candidate = derivative_path(original, extension)
+        if accepted.get(media_type, 0) > 0 and candidate.is_file():
+            return media_file_response(
+                request.headers, candidate, media_type=media_type, headers=headers
+            )
+
+    media_type, _ = mimetypes.guess_type(original.name)
+    return media_file_response(request.headers, original, media_type=media_type, headers=headers)
+
+
+@router.get("/sprites/{name}")
+def get_sprite(name: str, request: Request):
+    """Serve a contact sheet made by ``GET /api/bonsai/summary/sprite``.
+
+    Sheets are named after their content and cached for good. One evicted from
+    the rendition cache is regenerated by requesting its offset map again.
+    """
+
+    if name.startswith(".") or "/" in name or "\\" in name:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    path = cached_sprite(name)
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    return media_file_response(request.headers, path, media_type="image/jpeg")
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from fastapi import APIRouter
+
+from ..cache import detail_cache
+from ..config import settings
+from ..photo_jobs import photo_jobs
+from ..renditions import renditions
+from ..utils.images import thumbnail_format_stats
+from ..workers import image_pool
+
+router = APIRouter(prefix=f"{settings.api_prefix}/metrics", tags=["metrics"])
+
+
+@router.get("/")
+def read_metrics():
+    """Expose in-process counters used to size caches and worker pools."""
+
+    return {
+        "detail_cache": detail_cache.stats(),
+        "image_pool": image_pool.stats(),
+        "photo_jobs": photo_jobs.stats(),
+        "renditions": renditions.stats(),
+    }
+
+
+@router.get("/thumbnails")
+def read_thumbnail_metrics():
+    """Report stored thumbnail bytes per format and the savings of each derivative format."""
+
+    return thumbnail_format_stats()
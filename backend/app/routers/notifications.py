@@ -1,21 +1,31 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session
 
 from .. import models, schemas
 from ..config import settings
 from ..database import get_db
+from ..utils.serialization import json_response
 
 router = APIRouter(prefix=f"{settings.api_prefix}/notifications", tags=["notifications"])
 
 
+def _notifications_query(db: Session, read: Optional[bool] = None) -> Query:
+    query = db.query(models.Notification)
+    if read is not None:
+        query = query.filter(models.Notification.read == read)
+    return query.order_by(models.Notification.due_at.is_(None), models.Notification.due_at)
+
+
 @router.get("/", response_model=list[schemas.NotificationOut])
-def list_notifications(db: Session = Depends(get_db)):
-    return (
-        db.query(models.Notification)
-        .order_by(models.Notification.due_at.is_(None), models.Notification.due_at)
-        .all()
+def list_notifications(read: Optional[bool] = None, db: Session = Depends(get_db)):
+    notifications = _notifications_query(db, read).all()
+    return json_response(
+        [schemas.NotificationOut.from_row(notification) for notification in notifications],
+        list[schemas.NotificationOut],
     )
 
 
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from .. import models, schemas
+from ..config import settings
+from ..database import get_db
+from ..photo_jobs import UNFINISHED_STATES
+from ..utils.serialization import json_response
+
+router = APIRouter(prefix=f"{settings.api_prefix}/photo-jobs", tags=["photos"])
+
+PROCESSING_STATES = ("pending", "processing", "ready", "failed")
+
+
+@router.get("/", response_model=list[schemas.PhotoJobOut])
+def list_photo_jobs(
+    state: Optional[list[str]] = Query(default=None),
+    limit: int = Query(default=100, ge=1, le=500),
+    db: Session = Depends(get_db),
+):
+    """List photos uploaded with ``defer_processing`` that are not done yet, oldest first.
+
+    ``state`` may be repeated; it defaults to ``pending`` and ``processing``.
+    """
+
+    states = state or list(UNFINISHED_STATES)
+    unknown = sorted(set(states) - set(PROCESSING_STATES))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown state: {', '.join(unknown)}",
+        )
+
+    photos = (
+        db.query(models.Photo)
+        .filter(models.Photo.processing_state.in_(states))
+        .order_by(models.Photo.created_at, models.Photo.id)
+        .limit(limit)
+        .all()
+    )
+    return json_response(
+        [schemas.PhotoJobOut.from_model(photo) for photo in photos],
+        list[schemas.PhotoJobOut],
+    )
+
+
+@router.get("/{photo_id}", response_model=schemas.PhotoJobOut)
+def get_photo_job(photo_id: int, db: Session = Depends(get_db)):
+    photo = db.get(models.Photo, photo_id)
+    if not photo:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found")
+
+    return json_response(schemas.PhotoJobOut.from_model(photo), schemas.PhotoJobOut)
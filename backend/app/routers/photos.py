@@ -1,40 +1,45 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 from datetime import datetime
-from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
-from PIL import Image, ImageOps
+from PIL import Image
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
 from ..config import settings
 from ..database import get_db
-from ..utils.images import save_image_bytes
+from ..media_store import (
+    apply_stored_image,
+    find_stored_copy,
+    release_media,
+    resolve_media_path,
+    stored_image_of,
+)
+from ..photo_jobs import photo_jobs, store_incoming
+from ..utils.images import StoredImage, guess_extension, rotate_image_file, save_image_file
+from ..utils.serialization import json_response
+from ..utils.uploads import spooled_upload
+from ..workers import PoolSaturatedError, image_pool
 
 router = APIRouter(prefix=f"{settings.api_prefix}/bonsai", tags=["photos"])
+logger = logging.getLogger(__name__)
 
+# What a file that is not a usable image raises while it is decoded and stored;
+# ``UnidentifiedImageError`` and Pillow's decoder errors are ``OSError``s.
+IMAGE_ERRORS = (OSError, Image.DecompressionBombError)
 
-def _resolve_media_path(stored_path: Optional[str]) -> Optional[Path]:
-    if not stored_path:
-        return None
-
-    try:
-        candidate = Path(stored_path)
-    except TypeError as exc:  # pragma: no cover - defensive
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid stored media path",
-        ) from exc
 
-    if not candidate.is_absolute():
-        candidate = settings.media_root / candidate
-
-    return candidate
+def _rotate_photo_files(photo: models.Photo, degrees: int) -> None:
+    """Point ``photo`` at a rotated copy of its image.
 
+    The stored files may be shared with other photos, so they are never
+    rewritten in place; the caller releases the old paths after committing.
+    """
 
-def _rotate_photo_files(photo: models.Photo, degrees: int) -> None:
     normalized = degrees % 360
     if normalized == 0:
         return
@@ -45,40 +50,55 @@ def _rotate_photo_files(photo: models.Photo, degrees: int) -> None:
             detail="Rotation must be 0, 90, 180, or 270 degrees.",
         )
 
-    full_path = _resolve_media_path(photo.full_path)
+    full_path = resolve_media_path(photo.full_path)
     if not full_path or not full_path.exists():
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Stored photo file could not be found.",
         )
 
-    thumbnail_path = _resolve_media_path(photo.thumbnail_path)
-
-    suffix = full_path.suffix.lower()
-
     try:
-        with Image.open(full_path) as image:
-            try:
-                oriented = ImageOps.exif_transpose(image)
-            except Exception:  # pragma: no cover - fallback if EXIF data is invalid
-                oriented = image
-            rotated = oriented.rotate(-normalized, expand=True)
-            if suffix in {".jpg", ".jpeg"} and rotated.mode != "RGB":
-                rotated = rotated.convert("RGB")
-            rotated.save(full_path)
-
-            if thumbnail_path:
-                thumbnail_path.parent.mkdir(parents=True, exist_ok=True)
-                preview = rotated.copy()
-                if suffix in {".jpg", ".jpeg"} and preview.mode != "RGB":
-                    preview = preview.convert("RGB")
-                preview.thumbnail((settings.thumbnail_size, settings.thumbnail_size))
-                preview.save(thumbnail_path)
+        rotated = rotate_image_file(full_path, resolve_media_path(photo.thumbnail_path), normalized)
     except OSError as exc:  # pragma: no cover - best effort error propagation
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Unable to rotate stored photo.",
         ) from exc
+    apply_stored_image(photo, rotated)
+
+
+def _parse_taken_at(taken_at: str | None) -> Optional[datetime]:
+    if not taken_at:
+        return None
+    try:
+        return datetime.fromisoformat(taken_at)
+    except ValueError as exc:  # pragma: no cover - validated by FastAPI
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid taken_at format") from exc
+
+
+async def _store_upload(
+    db: Session, file: UploadFile, defer_processing: bool
+) -> Tuple[StoredImage, str]:
+    """Store one uploaded image and return what was stored and its processing state."""
+
+    extension = guess_extension(file.filename, file.content_type)
+    async with spooled_upload(
+        file,
+        max_bytes=settings.max_photo_upload_bytes,
+        suffix=extension,
+    ) as upload:
+        existing_copy = find_stored_copy(db, upload.sha256)
+        if existing_copy is not None:
+            # The same bytes were uploaded before: share the stored files and
+            # skip decoding and thumbnailing altogether.
+            return stored_image_of(existing_copy), "ready"
+        if defer_processing:
+            full_path = store_incoming(upload.path, upload.sha256, extension)
+            return StoredImage(full_path, "", upload.sha256), "pending"
+        stored = await image_pool.run(
+            save_image_file, upload.path, file.filename, file.content_type, upload.sha256
+        )
+        return stored, "ready"
 
 
 @router.post("/{bonsai_id}/photos", response_model=schemas.PhotoOut, status_code=status.HTTP_201_CREATED)
@@ -89,31 +109,38 @@ async def upload_photo(
     taken_at: str | None = Form(default=None),
     is_primary: bool = Form(default=False),
     update_id: int | None = Form(default=None),
+    defer_processing: bool = Form(default=False),
     db: Session = Depends(get_db),
 ):
+    """Store an uploaded photo and its thumbnail.
+
+    With ``defer_processing`` the upload is stored as-is and the photo is
+    returned with ``202`` in the ``pending`` state; thumbnails are produced in
+    the background and ``Location`` points at the job's status.
+    """
+
     bonsai = db.get(models.Bonsai, bonsai_id)
     if not bonsai:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Bonsai not found")
 
-    contents = await file.read()
-    full_path, thumb_path = save_image_bytes(contents, file.filename, file.content_type)
-
-    taken_at_dt = None
-    if taken_at:
-        try:
-            taken_at_dt = datetime.fromisoformat(taken_at)
-        except ValueError as exc:  # pragma: no cover - validated by FastAPI
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid taken_at format") from exc
+    try:
+        stored, processing_state = await _store_upload(db, file, defer_processing)
+    except PoolSaturatedError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many photos are being processed; try again shortly.",
+            headers={"Retry-After": "5"},
+        ) from exc
 
     photo = models.Photo(
         bonsai_id=bonsai_id,
         update_id=update_id,
         description=description,
-        taken_at=taken_at_dt,
-        full_path=full_path,
-        thumbnail_path=thumb_path,
+        taken_at=_parse_taken_at(taken_at),
+        processing_state=processing_state,
         is_primary=is_primary,
     )
+    apply_stored_image(photo, stored)
     if is_primary:
         for existing in bonsai.photos:
             existing.is_primary = False
@@ -121,7 +148,117 @@ async def upload_photo(
     db.add(photo)
     db.commit()
     db.refresh(photo)
-    return schemas.PhotoOut.from_model(photo)
+    if processing_state == "ready":
+        return schemas.PhotoOut.from_model(photo)
+
+    photo_jobs.enqueue(photo.id)
+    return json_response(
+        schemas.PhotoOut.from_model(photo),
+        schemas.PhotoOut,
+        status_code=status.HTTP_202_ACCEPTED,
+        headers={"Location": f"{settings.api_prefix}/photo-jobs/{photo.id}"},
+    )
+
+
+@router.post(
+    "/{bonsai_id}/photos/batch",
+    response_model=list[schemas.PhotoBatchItem],
+    status_code=status.HTTP_201_CREATED,
+)
+async def upload_photo_batch(
+    bonsai_id: int,
+    files: list[UploadFile] = File(...),
+    description: str | None = Form(default=None),
+    taken_at: str | None = Form(default=None),
+    primary_index: int | None = Form(default=None, ge=0),
+    update_id: int | None = Form(default=None),
+    defer_processing: bool = Form(default=False),
+    db: Session = Depends(get_db),
+):
+    """Store several photos of one tree in a single request.
+
+    Files are processed in parallel, at most one per image worker, and every
+    photo that succeeded is inserted in one transaction. The response lists one
+    result per file in upload order; a file that fails does not fail the batch,
+    but a batch in which no file succeeded is rejected with ``422``.
+    ``primary_index`` picks the file that becomes the tree's primary photo.
+    """
+
+    bonsai = db.get(models.Bonsai, bonsai_id)
+    if not bonsai:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Bonsai not found")
+    if len(files) > settings.max_batch_photo_files:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch may contain at most {settings.max_batch_photo_files} files.",
+        )
+    if primary_index is not None and primary_index >= len(files):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="primary_index is out of range")
+    taken_at_dt = _parse_taken_at(taken_at)
+
+    # Leave the pool's queue slots to other requests instead of claiming them all.
+    slots = asyncio.Semaphore(image_pool.workers)
+
+    async def store(file: UploadFile) -> Tuple[StoredImage, str] | str:
+        async with slots:
+            try:
+                return await _store_upload(db, file, defer_processing)
+            except HTTPException as exc:
+                return str(exc.detail)
+            except PoolSaturatedError:
+                return "Too many photos are being processed; try again shortly."
+            except IMAGE_ERRORS:
+                # Also catches disk errors while storing the file; keep those visible.
+                logger.warning("Batch upload of %r failed", file.filename, exc_info=True)
+                return "The file could not be processed as an image."
+
+    stored = await asyncio.gather(*(store(file) for file in files))
+
+    photos: list[Optional[models.Photo]] = []
+    for index, result in enumerate(stored):
+        if isinstance(result, str):
+            photos.append(None)
+            continue
+        stored_image, processing_state = result
+        photo = models.Photo(
+            bonsai_id=bonsai_id,
+            update_id=update_id,
+            description=description,
+            taken_at=taken_at_dt,
+            processing_state=processing_state,
+            is_primary=index == primary_index,
+        )
+        apply_stored_image(photo, stored_image)
+        photos.append(photo)
+
+    if all(photo is None for photo in photos):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[{"filename": file.filename, "error": error} for file, error in zip(files, stored)],
+        )
+
+    if primary_index is not None and photos[primary_index] is not None:
+        db.query(models.Photo).filter(
+            models.Photo.bonsai_id == bonsai_id, models.Photo.is_primary.is_(True)
+        ).update({models.Photo.is_primary: False}, synchronize_session=False)
+    db.add_all(photo for photo in photos if photo is not None)
+    # Build the response from the flushed rows; after the commit every photo
+    # would be reloaded one by one.
+    db.flush()
+    items = [
+        schemas.PhotoBatchItem.model_construct(
+            filename=file.filename,
+            photo=schemas.PhotoOut.from_model(photo) if photo is not None else None,
+            error=result if photo is None else None,
+        )
+        for file, photo, result in zip(files, photos, stored)
+    ]
+    pending = [photo.id for photo in photos if photo is not None and photo.processing_state != "ready"]
+    db.commit()
+
+    for photo_id in pending:
+        photo_jobs.enqueue(photo_id)
+    return json_response(items, list[schemas.PhotoBatchItem], status_code=status.HTTP_201_CREATED)
 
 
 @router.get("/{bonsai_id}/photos", response_model=list[schemas.PhotoOut])
@@ -130,7 +267,10 @@ def list_photos(bonsai_id: int, db: Session = Depends(get_db)):
     if not bonsai:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Bonsai not found")
 
-    return [schemas.PhotoOut.from_model(photo) for photo in bonsai.photos]
+    return json_response(
+        [schemas.PhotoOut.from_model(photo) for photo in bonsai.photos],
+        list[schemas.PhotoOut],
+    )
 
 
 @router.post("/{bonsai_id}/photos/{photo_id}/primary", response_model=schemas.PhotoOut)
@@ -154,30 +294,11 @@ def delete_photo(bonsai_id: int, photo_id: int, db: Session = Depends(get_db)):
     if not photo or photo.bonsai_id != bonsai_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found")
 
-    media_paths: list[Path] = []
-    for stored_path in (photo.full_path, photo.thumbnail_path):
-        if not stored_path:
-            continue
-
-        try:
-            candidate = Path(stored_path)
-        except TypeError:  # pragma: no cover - defensive
-            continue
-
-        if not candidate.is_absolute():
-            candidate = settings.media_root / candidate
-
-        media_paths.append(candidate)
-
+    full_path, thumbnail_path = photo.full_path, photo.thumbnail_path
     db.delete(photo)
     db.commit()
 
-    for path in media_paths:
-        try:
-            if path.exists() and path.is_file():
-                path.unlink()
-        except OSError:  # pragma: no cover - best effort cleanup
-            continue
+    release_media(db, full_path, thumbnail_path)
 
 
 @router.patch("/{bonsai_id}/photos/{photo_id}", response_model=schemas.PhotoOut)
@@ -194,7 +315,13 @@ def update_photo(
     data = payload.model_dump(exclude_unset=True)
 
     rotation = data.pop("rotate_degrees", None)
+    if rotation and photo.processing_state != "ready":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Photo is still being processed.",
+        )
 
+    previous_paths = (photo.full_path, photo.thumbnail_path)
     if rotation:
         _rotate_photo_files(photo, rotation)
 
@@ -209,4 +336,6 @@ def update_photo(
     db.add(photo)
     db.commit()
     db.refresh(photo)
+    if (photo.full_path, photo.thumbnail_path) != previous_paths:
+        release_media(db, *previous_paths)
     return schemas.PhotoOut.from_model(photo)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from .. import schemas
+from ..config import settings
+from ..database import get_db
+from ..search import KIND_CODES, search_documents
+from ..utils.pagination import decode_cursor, encode_cursor
+from ..utils.serialization import json_response
+
+router = APIRouter(prefix=f"{settings.api_prefix}/search", tags=["search"])
+
+
+def _decode_offset(cursor: Optional[str], q: str) -> int:
+    if not cursor:
+        return 0
+    try:
+        payload = decode_cursor(cursor)
+        if payload.get("q") != q:
+            raise ValueError("Cursor does not match the search query")
+        offset = int(payload["offset"])
+        if offset < 0:
+            raise ValueError("Invalid cursor offset")
+    except (KeyError, TypeError, ValueError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+    return offset
+
+
+@router.get("/", response_model=schemas.SearchPage)
+def search(
+    q: str = Query(min_length=1, max_length=200),
+    kind: Optional[list[str]] = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """Rank trees, care updates and species matching every word of ``q``.
+
+    Snippets are HTML-escaped text with the matched terms wrapped in ``<mark>``
+    tags. ``kind`` narrows results to ``bonsai``, ``update`` or ``species`` and
+    may be repeated.
+    """
+
+    unknown = sorted(set(kind or ()) - set(KIND_CODES))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown kind: {', '.join(unknown)}",
+        )
+
+    offset = _decode_offset(cursor, q)
+    rows = search_documents(db, q, kinds=kind, limit=limit + 1, offset=offset)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor({"q": q, "offset": offset + limit})
+
+    page = schemas.SearchPage.model_construct(
+        items=[
+            schemas.SearchResult.model_construct(
+                kind=row["kind"],
+                id=row["ref_id"],
+                bonsai_id=row["bonsai_id"],
+                title=row["title"],
+                snippet=row["snippet"],
+                rank=row["rank"],
+            )
+            for row in rows
+        ],
+        next_cursor=next_cursor,
+    )
+    return json_response(page, schemas.SearchPage)
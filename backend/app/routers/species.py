@@ -6,13 +6,15 @@ from sqlalchemy.orm import Session
 from .. import models, schemas
 from ..config import settings
 from ..database import get_db
+from ..utils.serialization import json_response
 
 router = APIRouter(prefix=f"{settings.api_prefix}/species", tags=["species"])
 
 
 @router.get("/", response_model=list[schemas.SpeciesOut])
 def list_species(db: Session = Depends(get_db)):
-    return db.query(models.Species).order_by(models.Species.common_name).all()
+    species = db.query(models.Species).order_by(models.Species.common_name).all()
+    return json_response([schemas.SpeciesOut.from_row(item) for item in species], list[schemas.SpeciesOut])
 
 
 @router.post("/", response_model=schemas.SpeciesOut, status_code=status.HTTP_201_CREATED)
@@ -29,7 +31,7 @@ def get_species(species_id: int, db: Session = Depends(get_db)):
     species = db.get(models.Species, species_id)
     if not species:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Species not found")
-    return species
+    return json_response(schemas.SpeciesOut.from_row(species), schemas.SpeciesOut)
 
 
 @router.patch("/{species_id}", response_model=schemas.SpeciesOut)
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session, selectinload
 from .. import models, schemas
 from ..config import settings
 from ..database import get_db
+from ..utils.serialization import json_response
 
 router = APIRouter(prefix=f"{settings.api_prefix}/bonsai", tags=["updates"])
 
@@ -89,13 +90,17 @@ def list_updates(bonsai_id: int, db: Session = Depends(get_db)):
     if not bonsai:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Bonsai not found")
 
-    return (
+    updates = (
         db.query(models.BonsaiUpdate)
         .options(selectinload(models.BonsaiUpdate.measurement))
         .filter(models.BonsaiUpdate.bonsai_id == bonsai_id)
         .order_by(models.BonsaiUpdate.performed_at.desc())
         .all()
     )
+    return json_response(
+        [schemas.BonsaiUpdateOut.from_row(update) for update in updates],
+        list[schemas.BonsaiUpdateOut],
+    )
 
 
 @router.patch(
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import date, datetime
-from typing import Optional
+from typing import Any, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
@@ -9,6 +9,16 @@ from .config import settings
 from . import models
 
 
+class RowModel(BaseModel):
+    """Response model that can be built from a trusted ORM row without validation."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_row(cls, row: Any):
+        return cls.model_construct(**{name: getattr(row, name) for name in cls.model_fields})
+
+
 class SpeciesBase(BaseModel):
     common_name: str
     scientific_name: Optional[str] = None
@@ -28,9 +38,7 @@ class SpeciesUpdate(BaseModel):
     tree_count: Optional[int] = Field(default=None, ge=0)
 
 
-class SpeciesOut(SpeciesBase):
-    model_config = ConfigDict(from_attributes=True)
-
+class SpeciesOut(SpeciesBase, RowModel):
     id: int
     tree_count: int
     created_at: datetime
@@ -80,14 +88,24 @@ class BonsaiUpdatePatch(BaseModel):
     measurement: Optional["MeasurementPayload"] = None
 
 
-class BonsaiUpdateOut(BonsaiUpdateBase):
-    model_config = ConfigDict(from_attributes=True)
-
+class BonsaiUpdateOut(BonsaiUpdateBase, RowModel):
     id: int
     created_at: datetime
     updated_at: datetime
     measurement: Optional["MeasurementOut"] = None
 
+    @classmethod
+    def from_row(cls, row: models.BonsaiUpdate) -> "BonsaiUpdateOut":
+        return cls.model_construct(
+            id=row.id,
+            title=row.title,
+            description=row.description,
+            performed_at=row.performed_at,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            measurement=MeasurementOut.from_row(row.measurement) if row.measurement else None,
+        )
+
 
 class MeasurementPayload(BaseModel):
     measured_at: Optional[datetime] = None
@@ -103,9 +121,7 @@ class MeasurementCreate(MeasurementPayload):
     update_id: int = Field(ge=1)
 
 
-class MeasurementOut(MeasurementBase):
-    model_config = ConfigDict(from_attributes=True)
-
+class MeasurementOut(MeasurementBase, RowModel):
     id: int
     created_at: datetime
 
@@ -120,11 +136,17 @@ class PhotoOut(BaseModel):
     thumbnail_url: str
     is_primary: bool
     created_at: datetime
+    processing_state: str = "ready"
+    width: Optional[int] = None
+    height: Optional[int] = None
+    byte_size: Optional[int] = None
+    dominant_color: Optional[str] = None
+    blurhash: Optional[str] = None
 
     @classmethod
     def from_model(cls, photo: models.Photo) -> "PhotoOut":
         base_url = settings.media_url.rstrip("/")
-        return cls(
+        return cls.model_construct(
             id=photo.id,
             description=photo.description,
             taken_at=photo.taken_at,
@@ -132,6 +154,12 @@ class PhotoOut(BaseModel):
             thumbnail_url=f"{base_url}/{photo.thumbnail_path}" if photo.thumbnail_path else "",
             is_primary=photo.is_primary,
             created_at=photo.created_at,
+            processing_state=photo.processing_state,
+            width=photo.width,
+            height=photo.height,
+            byte_size=photo.byte_size,
+            dominant_color=photo.dominant_color,
+            blurhash=photo.blurhash,
         )
 
 
@@ -152,6 +180,30 @@ class PhotoUpdate(BaseModel):
         return value
 
 
+class PhotoBatchItem(BaseModel):
+    filename: Optional[str] = None
+    photo: Optional[PhotoOut] = None
+    error: Optional[str] = None
+
+
+class PhotoJobOut(BaseModel):
+    photo_id: int
+    bonsai_id: int
+    processing_state: str
+    created_at: datetime
+    photo: PhotoOut
+
+    @classmethod
+    def from_model(cls, photo: models.Photo) -> "PhotoJobOut":
+        return cls.model_construct(
+            photo_id=photo.id,
+            bonsai_id=photo.bonsai_id,
+            processing_state=photo.processing_state,
+            created_at=photo.created_at,
+            photo=PhotoOut.from_model(photo),
+        )
+
+
 class AccoladeBase(BaseModel):
     title: str
     photo_id: Optional[int] = Field(default=None, ge=1)
@@ -176,7 +228,7 @@ class AccoladeOut(AccoladeBase):
 
     @classmethod
     def from_model(cls, accolade: models.Accolade) -> "AccoladeOut":
-        return cls(
+        return cls.model_construct(
             id=accolade.id,
             title=accolade.title,
             photo_id=accolade.photo_id,
@@ -207,9 +259,7 @@ class NotificationUpdate(BaseModel):
     read: Optional[bool] = None
 
 
-class NotificationOut(NotificationBase):
-    model_config = ConfigDict(from_attributes=True)
-
+class NotificationOut(NotificationBase, RowModel):
     id: int
     created_at: datetime
 
@@ -223,13 +273,23 @@ class GraveyardEntryCreate(GraveyardEntryBase):
     pass
 
 
-class GraveyardEntryOut(GraveyardEntryBase):
-    model_config = ConfigDict(from_attributes=True)
-
+class GraveyardEntryOut(GraveyardEntryBase, RowModel):
     id: int
     bonsai_id: int
     moved_at: datetime
 
+
+class GraveyardListItem(GraveyardEntryOut):
+    bonsai_name: str
+    species_name: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+
+
+class GraveyardPage(BaseModel):
+    items: list[GraveyardListItem] = Field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
 class BonsaiSummary(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -262,10 +322,26 @@ class BonsaiSummary(BaseModel):
         )
         latest_measurement = bonsai.measurements[0] if bonsai.measurements else None
 
-        return cls(
+        return cls.from_parts(bonsai, primary_photo, latest_measurement, latest_update)
+
+    @classmethod
+    def from_parts(
+        cls,
+        bonsai: models.Bonsai,
+        primary_photo: Optional[models.Photo],
+        latest_measurement: Optional[models.Measurement],
+        latest_update: Optional[models.BonsaiUpdate],
+    ) -> "BonsaiSummary":
+        """Build a summary from rows that were already selected by the caller.
+
+        Only ``bonsai.species`` and ``bonsai.graveyard_entry`` are read from the
+        tree itself, so the child collections never have to be loaded.
+        """
+
+        return cls.model_construct(
             id=bonsai.id,
             name=bonsai.name,
-            species=SpeciesOut.model_validate(bonsai.species) if bonsai.species else None,
+            species=SpeciesOut.from_row(bonsai.species) if bonsai.species else None,
             acquisition_date=bonsai.acquisition_date,
             origin_date=bonsai.origin_date,
             development_stage=bonsai.development_stage,
@@ -275,20 +351,56 @@ class BonsaiSummary(BaseModel):
             created_at=bonsai.created_at,
             updated_at=bonsai.updated_at,
             primary_photo=PhotoOut.from_model(primary_photo) if primary_photo else None,
-            latest_measurement=MeasurementOut.model_validate(latest_measurement)
+            latest_measurement=MeasurementOut.from_row(latest_measurement)
             if latest_measurement
             else None,
-            latest_update=BonsaiUpdateOut.model_validate(latest_update)
+            latest_update=BonsaiUpdateOut.from_row(latest_update)
             if latest_update
             else None,
             graveyard_entry=(
-                GraveyardEntryOut.model_validate(bonsai.graveyard_entry)
+                GraveyardEntryOut.from_row(bonsai.graveyard_entry)
                 if bonsai.graveyard_entry
                 else None
             ),
         )
 
 
+class BonsaiSummaryPage(BaseModel):
+    items: list[BonsaiSummary] = Field(default_factory=list)
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+class SpriteTile(BaseModel):
+    bonsai_id: int
+    photo_id: int
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+class SpriteSheet(BaseModel):
+    url: Optional[str] = None
+    width: int = 0
+    height: int = 0
+    tiles: list[SpriteTile] = Field(default_factory=list)
+
+
+class SearchResult(BaseModel):
+    kind: str
+    id: int
+    bonsai_id: Optional[int] = None
+    title: str
+    snippet: str
+    rank: float
+
+
+class SearchPage(BaseModel):
+    items: list[SearchResult] = Field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
 class BonsaiDetail(BonsaiSummary):
     photos: list[PhotoOut] = Field(default_factory=list)
     updates: list[BonsaiUpdateOut] = Field(default_factory=list)
@@ -299,16 +411,20 @@ class BonsaiDetail(BonsaiSummary):
     @classmethod
     def from_model(cls, bonsai: models.Bonsai) -> "BonsaiDetail":
         summary = BonsaiSummary.from_model(bonsai)
-        return cls(
-            **summary.model_dump(),
+        return cls.model_construct(
+            **{name: getattr(summary, name) for name in BonsaiSummary.model_fields},
             photos=[PhotoOut.from_model(photo) for photo in bonsai.photos],
-            updates=[BonsaiUpdateOut.model_validate(update) for update in bonsai.updates],
-            measurements=[
-                MeasurementOut.model_validate(measurement) for measurement in bonsai.measurements
-            ],
+            updates=[BonsaiUpdateOut.from_row(update) for update in bonsai.updates],
+            measurements=[MeasurementOut.from_row(measurement) for measurement in bonsai.measurements],
             notifications=[
-                NotificationOut.model_validate(notification)
-                for notification in bonsai.notifications
+                NotificationOut.from_row(notification) for notification in bonsai.notifications
             ],
             accolades=[AccoladeOut.from_model(accolade) for accolade in bonsai.accolades],
         )
+
+
+# Resolve the forward references up front so models built with ``model_construct``
+# can be serialized before any of them has been validated.
+BonsaiUpdateCreate.model_rebuild()
+BonsaiUpdatePatch.model_rebuild()
+BonsaiUpdateOut.model_rebuild()
@@ -0,0 +1,205 @@
+"""SQLite FTS5 index over trees, care updates and species.
+
+``search_index`` is a single FTS5 table holding one document per indexed row.
+The document rowid encodes its source (``source id * 4 + kind code``) so the
+sync triggers can replace a document without scanning the index. Triggers keep
+it current for ordinary writes; bulk loaders call :func:`suspend_search_triggers`
+first and :func:`rebuild_search_index` afterwards instead of paying for a
+trigger per row.
+"""
+from __future__ import annotations
+
+import html
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+SEARCH_TABLE = "search_index"
+SUSPEND_TABLE = "search_index_suspended"
+
+KIND_CODES = {"bonsai": 1, "update": 2, "species": 3}
+
+# snippet() wraps matches in these; they are swapped for <mark> tags once the
+# document text around them has been HTML-escaped.
+_MATCH_START = "\x02"
+_MATCH_END = "\x03"
+
+# Weights for bm25(): a hit in the title outranks one in the body or location.
+COLUMN_WEIGHTS = (10.0, 1.0, 2.0)
+
+
+@dataclass(frozen=True)
+class _Source:
+    kind: str
+    table: str
+    bonsai_id: str
+    title: str
+    body: str
+    location: str
+    watched: tuple[str, ...]
+
+
+SOURCES = (
+    _Source("bonsai", "bonsai", "id", "name", "notes", "location", ("name", "notes", "location")),
+    _Source(
+        "update",
+        "bonsai_updates",
+        "bonsai_id",
+        "title",
+        "description",
+        "NULL",
+        ("bonsai_id", "title", "description"),
+    ),
+    _Source(
+        "species",
+        "species",
+        "NULL",
+        "common_name",
+        "care_instructions",
+        "NULL",
+        ("common_name", "care_instructions"),
+    ),
+)
+
+Bind = Union[Connection, Session]
+
+
+def _document_select(source: _Source, prefix: str = "") -> str:
+    def column(name: str) -> str:
+        return name if name == "NULL" else f"{prefix}{name}"
+
+    code = KIND_CODES[source.kind]
+    return (
+        f"SELECT {prefix}id * 4 + {code}, '{source.kind}', {prefix}id, {column(source.bonsai_id)}, "
+        f"coalesce({column(source.title)}, ''), coalesce({column(source.body)}, ''), "
+        f"coalesce({column(source.location)}, '')"
+    )
+
+
+def _trigger_statements(source: _Source) -> list[str]:
+    code = KIND_CODES[source.kind]
+    guard = f"WHEN NOT EXISTS (SELECT 1 FROM {SUSPEND_TABLE})"
+    insert = (
+        f"INSERT INTO {SEARCH_TABLE} (rowid, kind, ref_id, bonsai_id, title, body, location) "
+        f"{_document_select(source, 'new.')};"
+    )
+    delete = f"DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 4 + {code};"
+    name = f"{SEARCH_TABLE}_{source.table}"
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON {source.table} {guard} "
+        f"BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_au AFTER UPDATE OF {', '.join(source.watched)} "
+        f"ON {source.table} {guard} BEGIN {delete} {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON {source.table} {guard} "
+        f"BEGIN {delete} END",
+    ]
+
+
+def _execute(bind: Bind, statement: str, params: Optional[dict] = None):
+    return bind.execute(text(statement), params or {})
+
+
+def create_search_index(conn: Connection) -> None:
+    """Create the FTS5 table, its sync triggers and populate it from existing rows."""
+
+    _execute(
+        conn,
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+        "kind UNINDEXED, ref_id UNINDEXED, bonsai_id UNINDEXED, title, body, location, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+    )
+    _execute(conn, f"CREATE TABLE IF NOT EXISTS {SUSPEND_TABLE} (id INTEGER PRIMARY KEY)")
+    for source in SOURCES:
+        for statement in _trigger_statements(source):
+            _execute(conn, statement)
+    rebuild_search_index(conn)
+
+
+def suspend_search_triggers(bind: Bind) -> None:
+    """Stop the sync triggers for the rest of the current transaction's bulk writes.
+
+    The flag is an ordinary row, so it is rolled back with the transaction if the
+    load fails; :func:`rebuild_search_index` clears it on success.
+    """
+
+    _execute(bind, f"INSERT OR IGNORE INTO {SUSPEND_TABLE} (id) VALUES (1)")
+
+
+def rebuild_search_index(bind: Bind) -> None:
+    """Repopulate the whole index with one ``INSERT ... SELECT`` per source table."""
+
+    _execute(bind, f"DELETE FROM {SEARCH_TABLE}")
+    for source in SOURCES:
+        _execute(
+            bind,
+            f"INSERT INTO {SEARCH_TABLE} (rowid, kind, ref_id, bonsai_id, title, body, location) "
+            f"{_document_select(source)} FROM {source.table}",
+        )
+    _execute(bind, f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')")
+    _execute(bind, f"DELETE FROM {SUSPEND_TABLE}")
+
+
+def match_expression(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 query matching every word as a prefix.
+
+    Each word is quoted so characters such as ``-`` or ``:`` in user input are
+    never parsed as FTS5 operators.
+    """
+
+    terms = [word.replace('"', "") for word in query.split()]
+    terms = [term for term in terms if term]
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search_documents(
+    bind: Bind,
+    query: str,
+    *,
+    kinds: Optional[list[str]] = None,
+    limit: int,
+    offset: int = 0,
+) -> list[dict]:
+    """Return up to ``limit`` ranked matches starting at ``offset``.
+
+    Each ``snippet`` is HTML: the document text is escaped and the matched
+    terms are wrapped in ``<mark>``.
+    """
+
+    expression = match_expression(query)
+    if expression is None:
+        return []
+
+    params: dict = {
+        "match": expression,
+        "start": _MATCH_START,
+        "end": _MATCH_END,
+        "limit": limit,
+        "offset": offset,
+    }
+    kind_filter = ""
+    if kinds:
+        placeholders = ", ".join(f":kind_{index}" for index in range(len(kinds)))
+        kind_filter = f"AND kind IN ({placeholders})"
+        params.update({f"kind_{index}": kind for index, kind in enumerate(kinds)})
+
+    weights = ", ".join(str(weight) for weight in COLUMN_WEIGHTS)
+    rows = _execute(
+        bind,
+        f"SELECT kind, ref_id, bonsai_id, title, "
+        f"snippet({SEARCH_TABLE}, -1, :start, :end, '…', 12) AS snippet, "
+        f"bm25({SEARCH_TABLE}, 0, 0, 0, {weights}) AS rank "
+        f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match {kind_filter} "
+        "ORDER BY rank, rowid LIMIT :limit OFFSET :offset",
+        params,
+    )
+    return [{**row._mapping, "snippet": _highlight(row.snippet)} for row in rows]
+
+
+def _highlight(snippet: str) -> str:
+    escaped = html.escape(snippet, quote=False)
+    return escaped.replace(_MATCH_START, "<mark>").replace(_MATCH_END, "</mark>")
@@ -4,8 +4,9 @@ from datetime import date, datetime
 
 from sqlalchemy.orm import Session
 
-from .database import SessionLocal, engine, Base
+from .database import SessionLocal
 from . import models
+from .migrations import upgrade
 
 
 SAMPLE_SPECIES = [
@@ -99,7 +100,7 @@ def seed_database(session: Session):
 
 
 def main():
-    Base.metadata.create_all(bind=engine)
+    upgrade()
     with SessionLocal() as session:
         seed_database(session)
 
@@ -0,0 +1,90 @@
+"""Contact sheets: the primary thumbnails of a page of trees in one image.
+
+A sheet is named after the photos it holds and their stored thumbnail paths.
+Those paths are content-addressed, so they change whenever a photo is
+replaced or rotated and a sheet's URL can be cached for good. Sheets are
+generated in the image pool and kept in the rendition disk cache.
+"""
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .config import settings
+from .media_store import resolve_media_path
+from .renditions import renditions
+from .utils.images import write_contact_sheet
+
+SPRITE_DIRECTORY = "sprites"
+
+
+@dataclass(frozen=True)
+class SpriteTile:
+    bonsai_id: int
+    photo_id: int
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+@dataclass
+class SpritePlan:
+    name: str
+    tile_size: int
+    columns: int
+    tiles: list[SpriteTile] = field(default_factory=list)
+    sources: list[Path] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        return f"{SPRITE_DIRECTORY}/{self.name}"
+
+    @property
+    def width(self) -> int:
+        return self.columns * self.tile_size
+
+    @property
+    def height(self) -> int:
+        return -(-len(self.tiles) // self.columns) * self.tile_size
+
+
+def plan_sprite(photos: Iterable[tuple[int, int, Optional[str]]]) -> Optional[SpritePlan]:
+    """Lay out ``(bonsai_id, photo_id, thumbnail_path)`` rows; ``None`` when none has a thumbnail.
+
+    Tiles are ordered by photo id, so any request for the same photos and
+    versions maps to the same sheet regardless of the page's sort order.
+    """
+
+    entries = []
+    for bonsai_id, photo_id, thumbnail_path in sorted(photos, key=lambda row: row[1]):
+        source = resolve_media_path(thumbnail_path)
+        if source is not None and source.is_file():
+            entries.append((bonsai_id, photo_id, thumbnail_path, source))
+    if not entries:
+        return None
+
+    size = settings.sprite_tile_size
+    columns = min(settings.sprite_columns, len(entries))
+    version = ";".join(f"{photo_id}:{thumbnail_path}" for _, photo_id, thumbnail_path, _ in entries)
+    digest = hashlib.sha256(f"{size}:{columns}|{version}".encode()).hexdigest()
+    plan = SpritePlan(name=f"{digest[:40]}.jpg", tile_size=size, columns=columns)
+    for index, (bonsai_id, photo_id, _, source) in enumerate(entries):
+        row, column = divmod(index, columns)
+        plan.tiles.append(SpriteTile(bonsai_id, photo_id, column * size, row * size, size, size))
+        plan.sources.append(source)
+    return plan
+
+
+async def ensure_sprite(plan: SpritePlan) -> Path:
+    """Return the sheet for ``plan``, generating it on first request."""
+
+    return await renditions.get_or_render(
+        plan.key, write_contact_sheet, plan.sources, plan.tile_size, plan.columns
+    )
+
+
+def cached_sprite(name: str) -> Optional[Path]:
+    return renditions.cache.get(f"{SPRITE_DIRECTORY}/{name}")
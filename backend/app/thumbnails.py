@@ -0,0 +1,289 @@
+"""Regenerate stored thumbnails and their derivatives in bulk.
+
+Run ``python -m app.thumbnails`` after changing ``THUMBNAIL_SIZE`` or the
+derivative formats, or after an import that lost thumbnails. Photos are walked
+in id order in batches; each batch is measured and rebuilt in a process pool,
+and thumbnails that are already newer than their image and the right size are
+skipped (``--force`` rebuilds them anyway). Progress is checkpointed after
+every batch, so an interrupted run picks up where it stopped when started again
+with the same options.
+
+Thumbnail URLs are cached as immutable, so a rebuilt thumbnail is written
+under a name carrying the thumbnail size and a digest of the new files
+(``thumbs/<hash>-300-1a2b3c4d.jpg``) and the photos are pointed at it; the old
+file is released once nothing uses it.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import settings
+from .database import SessionLocal
+from .media_store import release_media, resolve_media_path
+from .utils.images import (
+    derivative_formats,
+    derivative_path,
+    regenerate_thumbnail,
+    thumbnail_is_current,
+)
+
+BATCH_SIZE = 100
+DEFAULT_CHECKPOINT = settings.media_root / ".thumbnail-regeneration.json"
+
+REGENERATED = "regenerated"
+SKIPPED = "skipped"
+MISSING = "missing"
+FAILED = "failed"
+
+# ``-<size>`` and ``-<digest>`` added to the stem by earlier runs.
+_VERSION_SUFFIX = re.compile(r"(-\d+)?(-[0-9a-f]{8})?$")
+
+
+@dataclass
+class RegenerationReport:
+    regenerated: int = 0
+    skipped: int = 0
+    missing: int = 0
+    failed: int = 0
+    resumed_after: int = 0
+    seconds: float = 0.0
+
+    @property
+    def images_per_second(self) -> float:
+        return self.regenerated / self.seconds if self.seconds else 0.0
+
+    def count(self, outcome: str) -> None:
+        setattr(self, outcome, getattr(self, outcome) + 1)
+
+
+class Checkpoint:
+    """Last photo id handled by a run, valid only for the same options and settings."""
+
+    def __init__(self, path: Path, fingerprint: str) -> None:
+        self.path = path
+        self.fingerprint = fingerprint
+
+    def load(self) -> int:
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return 0
+        if data.get("fingerprint") != self.fingerprint:
+            return 0
+        return int(data.get("last_id", 0))
+
+    def save(self, last_id: int) -> None:
+        partial = self.path.with_name(f".{self.path.name}.tmp")
+        partial.write_text(json.dumps({"fingerprint": self.fingerprint, "last_id": last_id}))
+        os.replace(partial, self.path)
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+def _fingerprint(photo_ids: Sequence[int], bonsai_ids: Sequence[int], force: bool) -> str:
+    options = {
+        "photo_ids": sorted(photo_ids),
+        "bonsai_ids": sorted(bonsai_ids),
+        "force": force,
+        "thumbnail_size": settings.thumbnail_size,
+        "derivatives": derivative_formats(),
+    }
+    return hashlib.sha1(json.dumps(options, sort_keys=True).encode()).hexdigest()
+
+
+def versioned_thumbnail_path(thumbnail_path: str, size: int, digest: str) -> str:
+    """``thumbs/<hash>.jpg`` -> ``thumbs/<hash>-<size>-<digest>.jpg``, replacing an earlier version."""
+
+    path = Path(thumbnail_path)
+    stem = _VERSION_SUFFIX.sub("", path.stem, count=1)
+    return str(path.with_name(f"{stem}-{size}-{digest[:8]}{path.suffix}"))
+
+
+def _rebuild(source: Path, thumbnail_path: str) -> str:
+    """Write a new thumbnail next to ``thumbnail_path``, named after its bytes; returns its path."""
+
+    suffix = Path(thumbnail_path).suffix
+    staging = resolve_media_path(str(Path(thumbnail_path).with_name(f".rebuild-{os.getpid()}{suffix}")))
+    extensions = derivative_formats()
+    regenerate_thumbnail(source, staging)
+
+    # The digest covers the derivatives too, so a change of formats alone
+    # also gets a new URL. Unchanged output keeps the current name.
+    digest = hashlib.sha256(staging.read_bytes())
+    for extension in extensions:
+        digest.update(extension.encode())
+        digest.update(derivative_path(staging, extension).read_bytes())
+    target = versioned_thumbnail_path(thumbnail_path, settings.thumbnail_size, digest.hexdigest())
+
+    destination = resolve_media_path(target)
+    for extension in extensions:
+        os.replace(derivative_path(staging, extension), derivative_path(destination, extension))
+    os.replace(staging, destination)
+    return target
+
+
+def _regenerate(job: tuple[str, str, bool]) -> tuple[str, str]:
+    """Rebuild one thumbnail; returns the outcome and the path now holding it."""
+
+    full_path, thumbnail_path, force = job
+    source = resolve_media_path(full_path)
+    thumbnail = resolve_media_path(thumbnail_path)
+    if source is None or thumbnail is None or not source.is_file():
+        return MISSING, thumbnail_path
+    try:
+        if not force and thumbnail_is_current(source, thumbnail):
+            return SKIPPED, thumbnail_path
+        target = _rebuild(source, thumbnail_path)
+    except OSError:
+        return FAILED, thumbnail_path
+    return REGENERATED, target
+
+
+def _repoint(db: Session, renamed: dict[str, str]) -> None:
+    # Through the ORM so the trees' ``updated_at`` (and thus their ETags and
+    # cached details) change along with the paths.
+    for photo in db.query(models.Photo).filter(models.Photo.thumbnail_path.in_(renamed)):
+        photo.thumbnail_path = renamed[photo.thumbnail_path]
+    db.commit()
+    for previous in renamed:
+        release_media(db, None, previous)
+
+
+def regenerate_thumbnails(
+    db: Session,
+    executor: ProcessPoolExecutor,
+    checkpoint: Checkpoint,
+    *,
+    photo_ids: Sequence[int] = (),
+    bonsai_ids: Sequence[int] = (),
+    force: bool = False,
+    batch_size: int = BATCH_SIZE,
+    progress: bool = False,
+) -> RegenerationReport:
+    """Rebuild the thumbnails of ready photos, optionally limited to some photos or trees."""
+
+    report = RegenerationReport()
+    started = time.perf_counter()
+    last_id = report.resumed_after = checkpoint.load()
+
+    filters = [models.Photo.processing_state == "ready"]
+    if photo_ids:
+        filters.append(models.Photo.id.in_(photo_ids))
+    if bonsai_ids:
+        filters.append(models.Photo.bonsai_id.in_(bonsai_ids))
+
+    while True:
+        rows = db.execute(
+            select(models.Photo.id, models.Photo.full_path, models.Photo.thumbnail_path)
+            .where(models.Photo.id > last_id, *filters)
+            .order_by(models.Photo.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+
+        # Photos with the same content share files; rebuild each thumbnail once.
+        jobs: dict[str, tuple[str, str, bool]] = {}
+        for _, full_path, thumbnail_path in rows:
+            if not thumbnail_path:
+                report.count(MISSING)
+                continue
+            jobs.setdefault(thumbnail_path, (full_path, thumbnail_path, force))
+        renamed = {}
+        for thumbnail_path, (outcome, target) in zip(jobs, executor.map(_regenerate, jobs.values())):
+            report.count(outcome)
+            if target != thumbnail_path:
+                renamed[thumbnail_path] = target
+        if renamed:
+            _repoint(db, renamed)
+
+        last_id = rows[-1][0]
+        checkpoint.save(last_id)
+        if progress:
+            elapsed = time.perf_counter() - started
+            print(
+                f"Up to photo {last_id}: {report.regenerated} regenerated, {report.skipped} skipped "
+                f"({report.regenerated / elapsed if elapsed else 0:.1f} images/s)",
+                flush=True,
+            )
+
+    checkpoint.clear()
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def _get_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Regenerate photo thumbnails and their derivatives.")
+    parser.add_argument("--photo-id", type=int, action="append", default=[], help="Only this photo (repeatable).")
+    parser.add_argument(
+        "--bonsai-id", type=int, action="append", default=[], help="Only photos of this tree (repeatable)."
+    )
+    parser.add_argument("--force", action="store_true", help="Rebuild thumbnails that are already up to date.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes generating thumbnails in parallel (default: one per CPU).",
+    )
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Photos per batch and checkpoint.")
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=DEFAULT_CHECKPOINT,
+        help=f"Where progress is recorded for resuming (default: {DEFAULT_CHECKPOINT}).",
+    )
+    parser.add_argument("--restart", action="store_true", help="Ignore a saved checkpoint and start over.")
+    return parser
+
+
+def main() -> None:
+    args = _get_arg_parser().parse_args()
+    checkpoint = Checkpoint(args.checkpoint, _fingerprint(args.photo_id, args.bonsai_id, args.force))
+    if args.restart:
+        checkpoint.clear()
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=max(args.workers, 1), mp_context=multiprocessing.get_context("spawn")
+        ) as executor, SessionLocal() as db:
+            report = regenerate_thumbnails(
+                db,
+                executor,
+                checkpoint,
+                photo_ids=args.photo_id,
+                bonsai_ids=args.bonsai_id,
+                force=args.force,
+                batch_size=max(args.batch_size, 1),
+                progress=True,
+            )
+    except KeyboardInterrupt:
+        print(f"Interrupted; run the same command again to resume from {checkpoint.path}.")
+        raise SystemExit(130)
+
+    if report.resumed_after:
+        print(f"Resumed after photo {report.resumed_after}.")
+    print(
+        f"Regenerated {report.regenerated} thumbnails in {report.seconds:.1f}s "
+        f"({report.images_per_second:.1f} images/s); {report.skipped} already up to date."
+    )
+    if report.missing or report.failed:
+        print(f"{report.missing} photos have no stored image; {report.failed} could not be read.")
+
+
+if __name__ == "__main__":
+    main()
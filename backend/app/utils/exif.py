@@ -0,0 +1,129 @@
+"""Lossless JPEG rotation by rewriting the EXIF orientation tag.
+
+Only the metadata segment changes, so the compressed image data is copied
+byte for byte: no generation loss, and no decode of the full-size pixels.
+Anything that honours EXIF orientation (browsers, ``ImageOps.exif_transpose``
+and therefore this app's thumbnail and rendition code) shows the rotated image.
+"""
+from __future__ import annotations
+
+import struct
+from typing import Optional
+
+from PIL import Image
+
+ORIENTATION_TAG = 0x0112
+EXIF_HEADER = b"Exif\x00\x00"
+
+_SOI = b"\xff\xd8"
+_APP0 = 0xE0
+_APP1 = 0xE1
+# Markers after which no further metadata segments can follow.
+_SOS = 0xDA
+_EOI = 0xD9
+_MAX_SEGMENT_LENGTH = 0xFFFF
+
+# EXIF orientation -> (mirrored, clockwise degrees applied when displaying).
+_ORIENTATIONS = {
+    1: (False, 0),
+    6: (False, 90),
+    3: (False, 180),
+    8: (False, 270),
+    2: (True, 0),
+    7: (True, 90),
+    4: (True, 180),
+    5: (True, 270),
+}
+_BY_TRANSFORM = {transform: orientation for orientation, transform in _ORIENTATIONS.items()}
+
+
+def rotated_orientation(orientation: Optional[int], degrees: int) -> int:
+    """Return the orientation that shows an image rotated a further ``degrees`` clockwise."""
+
+    mirrored, rotation = _ORIENTATIONS.get(orientation or 1, (False, 0))
+    return _BY_TRANSFORM[(mirrored, (rotation + degrees) % 360)]
+
+
+def _find_exif_segment(data: bytes) -> tuple[int, Optional[tuple[int, int]]]:
+    """Return where a new APP1 segment would go and the (start, end) of an existing Exif one.
+
+    A new segment goes after the APP0 (JFIF/JFXX) segments leading the file,
+    which JFIF requires to come first, or straight after SOI when there are none.
+    """
+
+    if not data.startswith(_SOI):
+        raise ValueError("Not a JPEG file")
+    position = insert_at = len(_SOI)
+    while position + 4 <= len(data):
+        if data[position] != 0xFF:
+            raise ValueError("Malformed JPEG marker")
+        marker = data[position + 1]
+        if marker == 0xFF:  # fill byte before a marker
+            position += 1
+            continue
+        if marker in (_SOS, _EOI):
+            break
+        (length,) = struct.unpack(">H", data[position + 2 : position + 4])
+        end = position + 2 + length
+        if marker == _APP1 and data[position + 4 : position + 10] == EXIF_HEADER:
+            return position, (position, end)
+        if marker == _APP0 and position == insert_at:
+            insert_at = end
+        position = end
+    return insert_at, None
+
+
+def _patch_orientation_in_place(tiff: bytearray, degrees: int) -> bool:
+    """Rewrite an existing IFD0 orientation entry; False when there is none."""
+
+    byte_order = {b"II": "<", b"MM": ">"}.get(bytes(tiff[:2]))
+    if byte_order is None or len(tiff) < 8:
+        return False
+    (ifd_offset,) = struct.unpack(f"{byte_order}I", tiff[4:8])
+    if ifd_offset + 2 > len(tiff):
+        return False
+    (count,) = struct.unpack(f"{byte_order}H", tiff[ifd_offset : ifd_offset + 2])
+    for index in range(count):
+        entry = ifd_offset + 2 + index * 12
+        if entry + 12 > len(tiff):
+            return False
+        tag, field_type, value_count = struct.unpack(f"{byte_order}HHI", tiff[entry : entry + 8])
+        if tag != ORIENTATION_TAG:
+            continue
+        if field_type != 3 or value_count != 1:  # SHORT
+            return False
+        (current,) = struct.unpack(f"{byte_order}H", tiff[entry + 8 : entry + 10])
+        tiff[entry + 8 : entry + 10] = struct.pack(
+            f"{byte_order}H", rotated_orientation(current, degrees)
+        )
+        return True
+    return False
+
+
+def rotate_jpeg(data: bytes, degrees: int) -> bytes:
+    """Return ``data`` with its EXIF orientation turned ``degrees`` clockwise.
+
+    An existing orientation entry is patched in place so the rest of the EXIF
+    block (maker notes included) keeps its exact offsets. Without one, the
+    EXIF block is rebuilt with the tag added, or a minimal APP1 segment holding
+    only the orientation is inserted after SOI and any leading APP0 segments.
+    """
+
+    insert_at, segment = _find_exif_segment(data)
+    if segment is not None:
+        start, end = segment
+        tiff = bytearray(data[start + 10 : end])
+        if _patch_orientation_in_place(tiff, degrees):
+            return data[: start + 10] + bytes(tiff) + data[end:]
+        exif = Image.Exif()
+        exif.load(data[start + 4 : end])
+        before, after = data[:start], data[end:]
+    else:
+        exif = Image.Exif()
+        before, after = data[:insert_at], data[insert_at:]
+
+    exif[ORIENTATION_TAG] = rotated_orientation(exif.get(ORIENTATION_TAG), degrees)
+    payload = exif.tobytes()
+    if len(payload) + 2 > _MAX_SEGMENT_LENGTH:
+        raise ValueError("EXIF block too large for a single APP1 segment")
+    return before + bytes([0xFF, _APP1]) + struct.pack(">H", len(payload) + 2) + payload + after
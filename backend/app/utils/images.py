@@ -1,14 +1,19 @@
 from __future__ import annotations
 
+import hashlib
 import mimetypes
-from io import BytesIO
+import os
+import struct
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Tuple
+from typing import Optional, Sequence, Tuple
 from uuid import uuid4
 
 from PIL import Image, ImageOps
 
 from ..config import settings
+from .exif import rotate_jpeg
+from .placeholders import PREVIEW_SIZE, blurhash, dominant_color, preview_image
 
 
 def guess_extension(filename: str | None, content_type: str | None) -> str:
@@ -23,6 +28,10 @@ def guess_extension(filename: str | None, content_type: str | None) -> str:
     return ".jpg"
 
 
+# EXIF orientations that display the stored pixels on their side.
+_SWAPPED_ORIENTATIONS = {5, 6, 7, 8}
+
+
 def _apply_exif_orientation(image: Image.Image) -> Image.Image:
     try:
         return ImageOps.exif_transpose(image)
@@ -50,31 +59,373 @@ def _prepare_image_for_format(image: Image.Image, format_name: str) -> Image.Ima
     return image
 
 
-def save_image_bytes(content: bytes, filename: str | None, content_type: str | None) -> Tuple[str, str]:
-    """Save an image and its thumbnail, returning relative paths."""
+JPEG_EXTENSIONS = {".jpg", ".jpeg", ".jpe", ".jfif"}
 
-    extension = guess_extension(filename, content_type)
-    image_id = uuid4().hex
 
-    full_relative = Path("full") / f"{image_id}{extension}"
-    thumb_relative = Path("thumbs") / f"{image_id}{extension}"
+# Modern formats written next to each thumbnail, keyed by file extension:
+# (Pillow format, MIME type, save options).
+DERIVATIVE_FORMATS = {
+    "avif": ("AVIF", "image/avif", {"quality": 60}),
+    "webp": ("WEBP", "image/webp", {"quality": 80, "method": 4}),
+}
+
+
+def derivative_formats() -> list[str]:
+    """Configured derivative extensions that this Pillow build can encode, in preference order."""
+
+    Image.init()
+    return [
+        extension
+        for extension in settings.thumbnail_derivative_formats
+        if extension in DERIVATIVE_FORMATS and DERIVATIVE_FORMATS[extension][0] in Image.SAVE
+    ]
+
+
+def derivative_path(path: Path, extension: str) -> Path:
+    """Return where the ``extension`` derivative of ``path`` is stored (``a.jpg`` -> ``a.jpg.webp``)."""
+
+    return path.with_name(f"{path.name}.{extension}")
+
+
+def thumbnail_format_stats() -> dict:
+    """Total bytes of stored thumbnails per format, and what each derivative format saves.
+
+    Savings compare each derivative with the original-format thumbnail it was
+    made from, so photos that predate a format do not skew its ratio.
+    """
+
+    originals: dict[str, int] = {}
+    derivatives: dict[str, dict[str, int]] = {extension: {} for extension in DERIVATIVE_FORMATS}
+    with os.scandir(settings.media_root / "thumbs") as entries:
+        for entry in entries:
+            if not entry.is_file() or entry.name.startswith("."):
+                continue
+            base, _, extension = entry.name.rpartition(".")
+            if extension in derivatives and "." in base:
+                derivatives[extension][base] = entry.stat().st_size
+            else:
+                originals[entry.name] = entry.stat().st_size
+
+    formats = {}
+    for extension, sizes in derivatives.items():
+        derivative_bytes = sum(sizes.values())
+        original_bytes = sum(originals.get(base, 0) for base in sizes)
+        formats[extension] = {
+            "files": len(sizes),
+            "bytes": derivative_bytes,
+            "original_bytes": original_bytes,
+            "saved_bytes": original_bytes - derivative_bytes,
+            "saved_ratio": round(1 - derivative_bytes / original_bytes, 4) if original_bytes else 0.0,
+        }
+    return {
+        "thumbnails": len(originals),
+        "original_bytes": sum(originals.values()),
+        "formats": formats,
+    }
+
+
+# Passed to ``Image.thumbnail``: decode/reduce to at least this multiple of the
+# thumbnail box cheaply, then finish with a proper resampling filter.
+THUMBNAIL_REDUCING_GAP = 2.0
+CONTACT_SHEET_QUALITY = 80
+CONTACT_SHEET_BACKGROUND = (240, 253, 244)
+
+
+def write_thumbnail(
+    source: Path,
+    destination: Path,
+    format_name: Optional[str] = None,
+    *,
+    box: Optional[Tuple[int, int]] = None,
+    derivatives: Sequence[str] = (),
+) -> None:
+    """Write a thumbnail of the image stored at ``source``, fitted inside ``box``.
+
+    Each extension in ``derivatives`` (see :data:`DERIVATIVE_FORMATS`) is also
+    encoded from the same pixels to :func:`derivative_path`.
+
+    The image is not loaded before resizing, so for JPEGs ``Image.draft`` makes
+    libjpeg decode at 1/2, 1/4 or 1/8 scale (DCT scaling) and the full-size
+    pixels are never materialised. Other formats are shrunk with ``reduce``
+    before the final resample.
+    """
+
+    width, height = box or (settings.thumbnail_size, settings.thumbnail_size)
+    gap = THUMBNAIL_REDUCING_GAP
+    with Image.open(source) as image:
+        # ``box`` is in display orientation, but the pixels are fitted before
+        # they are rotated upright.
+        if image.getexif().get(0x0112) in _SWAPPED_ORIENTATIONS:
+            width, height = height, width
+        image.draft(None, (int(width * gap), int(height * gap)))
+        image.thumbnail((width, height), reducing_gap=gap)
+        thumbnail_image = _apply_exif_orientation(image)
+        format_name = format_name or _resolve_image_format(destination.suffix, image)
+        _save_thumbnail(thumbnail_image, destination, format_name, derivatives)
 
+
+def write_contact_sheet(
+    destination: Path, sources: Sequence[Path], tile_size: int, columns: int
+) -> None:
+    """Write ``sources`` as square, centre-cropped tiles of one JPEG, row by row.
+
+    Each source is decoded at close to the tile size with ``Image.draft``. A
+    source that cannot be read leaves its tile blank instead of failing the
+    whole sheet.
+    """
+
+    rows = max(-(-len(sources) // columns), 1)
+    sheet = Image.new("RGB", (columns * tile_size, rows * tile_size), CONTACT_SHEET_BACKGROUND)
+    for index, source in enumerate(sources):
+        try:
+            with Image.open(source) as image:
+                image.draft("RGB", (tile_size, tile_size))
+                tile = ImageOps.fit(
+                    _apply_exif_orientation(image).convert("RGB"), (tile_size, tile_size)
+                )
+        except OSError:
+            continue
+        row, column = divmod(index, columns)
+        sheet.paste(tile, (column * tile_size, row * tile_size))
+
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    partial = _partial_path(destination)
+    try:
+        sheet.save(partial, format="JPEG", quality=CONTACT_SHEET_QUALITY, optimize=True, progressive=True)
+        os.replace(partial, destination)
+    finally:
+        if partial.exists():
+            partial.unlink()
+
+
+def _save_thumbnail(
+    image: Image.Image, destination: Path, format_name: str, derivatives: Sequence[str]
+) -> None:
+    _prepare_image_for_format(image, format_name).save(destination, format=format_name)
+    for extension in derivatives:
+        derivative_format, _, options = DERIVATIVE_FORMATS[extension]
+        image.save(derivative_path(destination, extension), format=derivative_format, **options)
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        while chunk := handle.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _partial_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+
+
+def _replace_thumbnail(partial: Path, thumb_path: Path, extensions: Sequence[str]) -> None:
+    # Content-addressed names can be written by two workers at once (the same
+    # photo uploaded twice); each writes privately and renames into place.
+    for extension in extensions:
+        os.replace(derivative_path(partial, extension), derivative_path(thumb_path, extension))
+    os.replace(partial, thumb_path)
+
+
+def _write_thumbnail_atomically(source: Path, thumb_path: Path, format_name: str) -> None:
+    partial = _partial_path(thumb_path)
+    extensions = derivative_formats()
+    write_thumbnail(source, partial, format_name, derivatives=extensions)
+    _replace_thumbnail(partial, thumb_path, extensions)
+
+
+def thumbnail_is_current(source: Path, thumbnail: Path) -> bool:
+    """Whether ``thumbnail`` matches ``source`` under the current settings.
+
+    It must be newer than ``source``, have every configured derivative, and be
+    the size :func:`write_thumbnail` would produce now. Only headers are read.
+    """
+
+    try:
+        if thumbnail.stat().st_mtime < source.stat().st_mtime:
+            return False
+    except FileNotFoundError:
+        return False
+    if not all(derivative_path(thumbnail, extension).is_file() for extension in derivative_formats()):
+        return False
+    with Image.open(thumbnail) as image:
+        thumbnail_side = max(image.size)
+    with Image.open(source) as image:
+        expected_side = min(settings.thumbnail_size, max(image.size))
+    # ``Image.thumbnail`` rounds the shorter side, and draft decoding may shave a pixel.
+    return abs(thumbnail_side - expected_side) <= 1
+
+
+def regenerate_thumbnail(source: Path, thumbnail: Path) -> None:
+    """Rewrite ``thumbnail`` and its derivatives from ``source`` with the current settings."""
+
+    thumbnail.parent.mkdir(parents=True, exist_ok=True)
+    format_name = Image.registered_extensions().get(thumbnail.suffix.lower(), "JPEG")
+    _write_thumbnail_atomically(source, thumbnail, format_name)
+
+
+def _media_paths(name: str, extension: str) -> Tuple[Path, Path, str, str]:
+    full_relative = f"full/{name}{extension}"
+    thumb_relative = f"thumbs/{name}{extension}"
     full_path = settings.media_root / full_relative
     thumb_path = settings.media_root / thumb_relative
-
     full_path.parent.mkdir(parents=True, exist_ok=True)
     thumb_path.parent.mkdir(parents=True, exist_ok=True)
+    return full_path, thumb_path, full_relative, thumb_relative
+
+
+@dataclass(frozen=True)
+class StoredImage:
+    """Where an image was stored and what clients need to lay it out before it loads."""
+
+    full_path: str
+    thumbnail_path: str
+    content_hash: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    byte_size: Optional[int] = None
+    dominant_color: Optional[str] = None
+    blurhash: Optional[str] = None
+
+
+def _oriented_size(path: Path) -> Tuple[int, int]:
+    # Reads the header only.
+    with Image.open(path) as image:
+        width, height = image.size
+        if image.getexif().get(0x0112) in _SWAPPED_ORIENTATIONS:
+            return height, width
+        return width, height
+
+
+def _describe(
+    full_path: Path, full_relative: str, thumb_relative: str, content_hash: Optional[str], preview: Image.Image
+) -> StoredImage:
+    width, height = _oriented_size(full_path)
+    return StoredImage(
+        full_path=full_relative,
+        thumbnail_path=thumb_relative,
+        content_hash=content_hash,
+        width=width,
+        height=height,
+        byte_size=full_path.stat().st_size,
+        dominant_color=dominant_color(preview),
+        blurhash=blurhash(preview),
+    )
+
+
+def describe_stored_image(
+    full_relative: str, thumb_relative: str, content_hash: Optional[str] = None
+) -> StoredImage:
+    """Measure already stored files: header of the full image, pixels of the thumbnail only."""
+
+    full_path = settings.media_root / full_relative
+    thumb_path = settings.media_root / thumb_relative
+    with Image.open(thumb_path if thumb_path.is_file() else full_path) as image:
+        image.draft("RGB", (PREVIEW_SIZE * 4, PREVIEW_SIZE * 4))
+        preview = preview_image(_apply_exif_orientation(image))
+    return _describe(full_path, full_relative, thumb_relative, content_hash, preview)
+
+
+def save_image_file(
+    source: Path,
+    filename: str | None,
+    content_type: str | None,
+    name: Optional[str] = None,
+) -> StoredImage:
+    """Save the image at ``source`` and its thumbnail.
 
-    with Image.open(BytesIO(content)) as source_image:
+    ``name`` is the stored file stem, normally the upload's content hash; a
+    random one is used when it is omitted. Dimensions and placeholders are
+    taken from the same decode that produces the stored full image.
+    """
+
+    extension = guess_extension(filename, content_type)
+    full_path, thumb_path, full_relative, thumb_relative = _media_paths(
+        name or uuid4().hex, extension
+    )
+
+    with Image.open(source) as source_image:
         oriented = _apply_exif_orientation(source_image)
         format_name = _resolve_image_format(extension, oriented)
         prepared_full = _prepare_image_for_format(oriented, format_name)
 
-        prepared_full.save(full_path, format=format_name)
+        partial = _partial_path(full_path)
+        prepared_full.save(partial, format=format_name)
+        os.replace(partial, full_path)
+        preview = preview_image(oriented)
+
+    _write_thumbnail_atomically(source, thumb_path, format_name)
+    return _describe(full_path, full_relative, thumb_relative, name, preview)
+
+
+# Clockwise rotation in degrees -> the equivalent ``Image.transpose`` method.
+_TRANSPOSE_CLOCKWISE = {
+    90: Image.Transpose.ROTATE_270,
+    180: Image.Transpose.ROTATE_180,
+    270: Image.Transpose.ROTATE_90,
+}
+
+
+def _write_file_atomically(data: bytes, destination: Path) -> None:
+    partial = _partial_path(destination)
+    partial.write_bytes(data)
+    os.replace(partial, destination)
+
+
+def _rotate_full_image(source: Path, degrees: int) -> Tuple[Path, str]:
+    """Rotate the pixels of ``source`` into a staging file; returns it and its hash."""
+
+    extension = source.suffix
+    with Image.open(source) as image:
+        oriented = _apply_exif_orientation(image)
+        format_name = _resolve_image_format(extension, oriented)
+        rotated = _prepare_image_for_format(oriented.transpose(_TRANSPOSE_CLOCKWISE[degrees]), format_name)
+
+        staging = _partial_path(settings.media_root / "full" / f"rotated{extension}")
+        staging.parent.mkdir(parents=True, exist_ok=True)
+        rotated.save(staging, format=format_name)
+
+    return staging, file_sha256(staging)
+
+
+def rotate_image_file(source: Path, thumbnail: Optional[Path], degrees: int) -> StoredImage:
+    """Store a copy of ``source`` rotated clockwise by ``degrees`` under its own hash.
+
+    JPEGs are rotated losslessly by rewriting their EXIF orientation (see
+    :mod:`app.utils.exif`); other formats are transposed pixel for pixel. The
+    thumbnail and its derivatives are rotated from the existing ``thumbnail``
+    when there is one, so the full-size image is never decoded for them.
+
+    The original files are left untouched because other photos may share them.
+    """
+
+    extension = source.suffix
+    rotated_bytes = None
+    if extension.lower() in JPEG_EXTENSIONS:
+        try:
+            rotated_bytes = rotate_jpeg(source.read_bytes(), degrees)
+        except (ValueError, struct.error):
+            rotated_bytes = None
+
+    if rotated_bytes is not None:
+        content_hash = hashlib.sha256(rotated_bytes).hexdigest()
+        full_path, thumb_path, full_relative, thumb_relative = _media_paths(content_hash, extension)
+        _write_file_atomically(rotated_bytes, full_path)
+    else:
+        staging, content_hash = _rotate_full_image(source, degrees)
+        full_path, thumb_path, full_relative, thumb_relative = _media_paths(content_hash, extension)
+        os.replace(staging, full_path)
 
-        thumbnail_image = prepared_full.copy()
-        thumbnail_image.thumbnail((settings.thumbnail_size, settings.thumbnail_size))
-        thumbnail_image = _prepare_image_for_format(thumbnail_image, format_name)
-        thumbnail_image.save(thumb_path, format=format_name)
+    format_name = Image.registered_extensions().get(extension.lower(), "JPEG")
+    if thumbnail is None or not thumbnail.is_file():
+        _write_thumbnail_atomically(full_path, thumb_path, format_name)
+        return describe_stored_image(full_relative, thumb_relative, content_hash)
 
-    return str(full_relative).replace("\\", "/"), str(thumb_relative).replace("\\", "/")
+    partial = _partial_path(thumb_path)
+    extensions = derivative_formats()
+    with Image.open(thumbnail) as image:
+        rotated = image.transpose(_TRANSPOSE_CLOCKWISE[degrees])
+        _save_thumbnail(rotated, partial, format_name, extensions)
+        preview = preview_image(rotated)
+    _replace_thumbnail(partial, thumb_path, extensions)
+    return _describe(full_path, full_relative, thumb_relative, content_hash, preview)
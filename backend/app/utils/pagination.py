@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Any
+
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def encode_cursor(payload: dict[str, Any]) -> str:
+    """Serialize a cursor payload into an opaque, URL-safe token."""
+
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> dict[str, Any]:
+    """Reverse :func:`encode_cursor`, raising ``ValueError`` for malformed tokens."""
+
+    padded = token + "=" * (-len(token) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, json.JSONDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid cursor")
+    return payload
+
+
+def keyset_after(
+    column: ColumnElement,
+    tiebreaker: ColumnElement,
+    value: Any,
+    tiebreaker_value: Any,
+    *,
+    descending: bool,
+) -> ColumnElement[bool]:
+    """Return a filter selecting rows that sort strictly after ``(value, tiebreaker_value)``.
+
+    ``NULL`` values are treated as sorting first in ascending order and last in
+    descending order, matching the ``nulls_first``/``nulls_last`` ordering used
+    alongside this helper. Columns declared ``NOT NULL`` are compared as a row
+    value, which SQLite turns into a range seek on a ``(column, tiebreaker)``
+    index.
+    """
+
+    if not _nullable(column):
+        if descending:
+            return tuple_(column, tiebreaker) < (value, tiebreaker_value)
+        return tuple_(column, tiebreaker) > (value, tiebreaker_value)
+
+    if descending:
+        if value is None:
+            return and_(column.is_(None), tiebreaker < tiebreaker_value)
+        return or_(
+            column < value,
+            and_(column == value, tiebreaker < tiebreaker_value),
+            column.is_(None),
+        )
+
+    if value is None:
+        return or_(
+            and_(column.is_(None), tiebreaker > tiebreaker_value),
+            column.is_not(None),
+        )
+    return or_(column > value, and_(column == value, tiebreaker > tiebreaker_value))
+
+
+def keyset_order(column: ColumnElement, tiebreaker: ColumnElement, *, descending: bool) -> list:
+    """Return the ``ORDER BY`` clauses matching :func:`keyset_after`."""
+
+    if not _nullable(column):
+        if descending:
+            return [column.desc(), tiebreaker.desc()]
+        return [column.asc(), tiebreaker.asc()]
+    if descending:
+        return [column.desc().nulls_last(), tiebreaker.desc()]
+    return [column.asc().nulls_first(), tiebreaker.asc()]
+
+
+def _nullable(column: ColumnElement) -> bool:
+    # Mapped attributes proxy ``nullable`` from their column; expressions
+    # without one are assumed to allow NULL.
+    return getattr(column, "nullable", True)
@@ -0,0 +1,104 @@
+"""Tiny stand-ins shown while a photo loads: a dominant colour and a BlurHash.
+
+The BlurHash encoder follows the reference algorithm (https://blurha.sh): the
+image is reduced to a few cosine components and packed into a short base83
+string that clients decode into a blurred preview.
+"""
+from __future__ import annotations
+
+import math
+from typing import Tuple
+
+from PIL import Image
+
+PREVIEW_SIZE = 32
+_BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+_SRGB_TO_LINEAR = [
+    value / 12.92 if value <= 0.04045 else ((value + 0.055) / 1.055) ** 2.4
+    for value in (index / 255 for index in range(256))
+]
+
+
+def preview_image(image: Image.Image, size: int = PREVIEW_SIZE) -> Image.Image:
+    """Return a small RGB copy of ``image`` without resampling every source pixel."""
+
+    if image.mode not in ("RGB", "RGBA", "L", "LA"):
+        image = image.convert("RGB")
+    factor = max(image.size) // (size * 4)
+    small = image.reduce(factor) if factor > 1 else image.copy()
+    small.thumbnail((size, size))
+    return small.convert("RGB")
+
+
+def dominant_color(preview: Image.Image) -> str:
+    """Most common colour of ``preview`` after quantising it to a few colours, as ``#rrggbb``."""
+
+    quantized = preview.quantize(colors=5, method=Image.Quantize.MEDIANCUT)
+    _, index = max(quantized.getcolors())
+    palette = quantized.getpalette()
+    red, green, blue = palette[index * 3 : index * 3 + 3]
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def _encode83(value: int, length: int) -> str:
+    return "".join(
+        _BASE83[(value // 83 ** (length - position - 1)) % 83] for position in range(length)
+    )
+
+
+def _linear_to_srgb(value: float) -> int:
+    value = min(max(value, 0.0), 1.0)
+    if value <= 0.0031308:
+        return int(value * 12.92 * 255 + 0.5)
+    return int((1.055 * value ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def _sign_pow(value: float, exponent: float) -> float:
+    return math.copysign(abs(value) ** exponent, value)
+
+
+def blurhash(preview: Image.Image, components: Tuple[int, int] | None = None) -> str:
+    """Encode ``preview`` (see :func:`preview_image`) as a BlurHash string."""
+
+    width, height = preview.size
+    if components is None:
+        components = (4, 3) if width >= height else (3, 4)
+    x_components, y_components = components
+
+    pixels = [tuple(_SRGB_TO_LINEAR[channel] for channel in pixel) for pixel in preview.getdata()]
+    cos_x = [[math.cos(math.pi * i * x / width) for x in range(width)] for i in range(x_components)]
+    cos_y = [[math.cos(math.pi * j * y / height) for y in range(height)] for j in range(y_components)]
+
+    factors = []
+    for j in range(y_components):
+        for i in range(x_components):
+            scale = (1 if i == 0 and j == 0 else 2) / (width * height)
+            red = green = blue = 0.0
+            for y in range(height):
+                row = y * width
+                basis_y = cos_y[j][y]
+                for x in range(width):
+                    basis = basis_y * cos_x[i][x]
+                    pixel = pixels[row + x]
+                    red += basis * pixel[0]
+                    green += basis * pixel[1]
+                    blue += basis * pixel[2]
+            factors.append((red * scale, green * scale, blue * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = _encode83((x_components - 1) + (y_components - 1) * 9, 1)
+    if ac:
+        quantised_max = max(0, min(82, int(max(abs(value) for factor in ac for value in factor) * 166 - 0.5)))
+        maximum = (quantised_max + 1) / 166
+    else:
+        quantised_max, maximum = 0, 1.0
+    result += _encode83(quantised_max, 1)
+    result += _encode83(
+        (_linear_to_srgb(dc[0]) << 16) + (_linear_to_srgb(dc[1]) << 8) + _linear_to_srgb(dc[2]), 4
+    )
+    for factor in ac:
+        red, green, blue = (
+            max(0, min(18, int(_sign_pow(value / maximum, 0.5) * 9 + 9.5))) for value in factor
+        )
+        result += _encode83(red * 19 * 19 + green * 19 + blue, 2)
+    return result
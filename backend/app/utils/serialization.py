@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+from fastapi import Response, status
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _adapter(annotation: Any) -> TypeAdapter:
+    return TypeAdapter(annotation)
+
+
+def json_response(
+    content: Any,
+    annotation: Any,
+    *,
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """Encode already-built response models straight to JSON bytes.
+
+    Routes that assemble their models from trusted ORM rows use this instead of
+    returning the models to FastAPI, which would validate them against
+    ``response_model`` again and encode them through ``jsonable_encoder``.
+    The route's ``response_model`` still documents the shape in OpenAPI.
+    """
+
+    return Response(
+        content=_adapter(annotation).dump_json(content),
+        status_code=status_code,
+        headers=dict(headers) if headers else None,
+        media_type="application/json",
+    )
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Mapping, Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, PathLike, StaticFiles
+from starlette.types import Scope
+
+# Stored media is never rewritten: every content change (upload, rotation)
+# produces a new content-hashed filename, so a URL can be cached for good.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+def media_etag(path: Path, stat_result: os.stat_result) -> str:
+    """Strong ETag for a stored media file.
+
+    Built from the versioned file name and size rather than the mtime, so it
+    survives backup restores and copies between machines.
+    """
+
+    digest = hashlib.sha256(f"{path.name}:{stat_result.st_size}".encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+class MediaFileResponse(FileResponse):
+    """``FileResponse`` with :func:`media_etag` and a configurable ``Cache-Control``.
+
+    Range requests are handled by ``FileResponse``; ``If-Range`` is matched
+    against the ETag sent here.
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        *,
+        cache_control: str = IMMUTABLE_CACHE_CONTROL,
+        headers: Optional[Mapping[str, str]] = None,
+        **kwargs,
+    ) -> None:
+        merged = {"Cache-Control": cache_control, **(headers or {})}
+        super().__init__(path, headers=merged, **kwargs)
+        if self.stat_result is None:
+            # Stat up front so the ETag is known for conditional requests.
+            self.stat_result = os.stat(self.path)
+            self.set_stat_headers(self.stat_result)
+
+    def set_stat_headers(self, stat_result: os.stat_result) -> None:
+        self.headers.setdefault("etag", media_etag(Path(self.path), stat_result))
+        super().set_stat_headers(stat_result)
+
+    def _should_use_range(self, http_if_range: str, stat_result: os.stat_result) -> bool:
+        return http_if_range == self.headers["etag"] or super()._should_use_range(
+            http_if_range, stat_result
+        )
+
+
+def _is_not_modified(response: Response, request_headers: Headers) -> bool:
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    etag = response.headers["etag"]
+    return if_none_match.strip() == "*" or etag in [
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    ]
+
+
+def media_file_response(
+    request_headers: Headers,
+    path: Path,
+    *,
+    media_type: Optional[str] = None,
+    cache_control: str = IMMUTABLE_CACHE_CONTROL,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """Serve ``path`` as media, answering a matching ``If-None-Match`` with ``304``."""
+
+    response = MediaFileResponse(
+        path, media_type=media_type, cache_control=cache_control, headers=headers
+    )
+    if _is_not_modified(response, request_headers):
+        return NotModifiedResponse(response.headers)
+    return response
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """``StaticFiles`` for versioned media: immutable caching and strong ETags."""
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        response = MediaFileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        if _is_not_modified(response, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
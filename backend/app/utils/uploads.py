@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import tempfile
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Sequence
+
+from fastapi import HTTPException, UploadFile, status
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import settings
+
+
+def _too_large_detail(limit: int) -> str:
+    return f"Upload exceeds the limit of {limit} bytes."
+
+
+@dataclass(frozen=True)
+class SpooledFile:
+    path: Path
+    size: int
+    sha256: str
+
+
+@asynccontextmanager
+async def spooled_upload(
+    file: UploadFile, *, max_bytes: int, suffix: str = ""
+) -> AsyncIterator[SpooledFile]:
+    """Copy ``file`` to a named temporary file in chunks and yield it with its hash.
+
+    Only one chunk is held in memory at a time, and the copy stops with ``413``
+    as soon as ``max_bytes`` is exceeded. The file is removed on exit.
+    """
+
+    handle = tempfile.NamedTemporaryFile(
+        delete=False, suffix=suffix, dir=settings.upload_tmp_dir
+    )
+    path = Path(handle.name)
+    try:
+        digest = hashlib.sha256()
+        with handle:
+            written = 0
+            while chunk := await file.read(settings.upload_chunk_size):
+                written += len(chunk)
+                if written > max_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=_too_large_detail(max_bytes),
+                    )
+                digest.update(chunk)
+                handle.write(chunk)
+        yield SpooledFile(path=path, size=written, sha256=digest.hexdigest())
+    finally:
+        try:
+            os.unlink(path)
+        except OSError:  # pragma: no cover - best effort cleanup
+            pass
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+class UploadSizeLimitMiddleware:
+    """Reject oversized ``POST`` bodies while they are still being received.
+
+    ``limits`` pairs a path regular expression with a byte limit. Requests that
+    declare a larger ``Content-Length`` are refused before any of the body is
+    read; bodies without one are counted as they stream in and cut off at the
+    limit, so the multipart parser never spools more than that to disk.
+    """
+
+    def __init__(self, app: ASGIApp, limits: Sequence[tuple[str, int]]) -> None:
+        self.app = app
+        self.limits = [(re.compile(pattern), limit) for pattern, limit in limits]
+
+    def _limit_for(self, path: str) -> int | None:
+        for pattern, limit in self.limits:
+            if pattern.match(path):
+                return limit
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limit = None
+        if scope["type"] == "http" and scope["method"] == "POST":
+            limit = self._limit_for(scope["path"])
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        too_large = JSONResponse(
+            {"detail": _too_large_detail(limit)},
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+        headers = dict(scope["headers"])
+        declared = headers.get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            await too_large(scope, receive, send)
+            return
+
+        received = 0
+        exceeded = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
+                    raise _BodyTooLarge()
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            # The framework turns the aborted read into its own error response;
+            # drop it in favour of the 413 below.
+            if not exceeded:
+                await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not exceeded:
+                raise
+        if exceeded:
+            await too_large(scope, receive, send)
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+from typing import Any, Callable, Optional, TypeVar
+
+from .config import settings
+
+T = TypeVar("T")
+
+
+class PoolSaturatedError(RuntimeError):
+    """Raised when a job is submitted while every worker and queue slot is taken."""
+
+
+class ProcessPool:
+    """Bounded process pool for CPU-heavy work submitted from async endpoints.
+
+    At most ``workers + queue_depth`` jobs are accepted at once; further
+    submissions fail fast with :class:`PoolSaturatedError` instead of piling up
+    behind a backlog the client will time out on. The executor is created on
+    first use so importing the app does not start any processes.
+    """
+
+    def __init__(self, workers: int, queue_depth: int) -> None:
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Spawned workers do not inherit the server's threads, sockets or
+                # database connections, and behave the same on every platform.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _reserve(self) -> None:
+        with self._lock:
+            if self.in_flight >= self.workers + self.queue_depth:
+                self.rejected += 1
+                raise PoolSaturatedError("All image workers are busy")
+            self.in_flight += 1
+
+    def _release(self, succeeded: bool) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if succeeded:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run ``func(*args)`` in a worker process without blocking the event loop."""
+
+        self._reserve()
+        succeeded = False
+        try:
+            executor = self._get_executor()
+            result = await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+            succeeded = True
+            return result
+        except BrokenProcessPool:
+            # A worker died (for example on a decompression bomb); start a fresh pool
+            # for the next job rather than failing every later submission.
+            self._discard_executor(executor)
+            raise
+        finally:
+            self._release(succeeded)
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_depth": self.queue_depth,
+                "running": min(self.in_flight, self.workers),
+                "queued": max(self.in_flight - self.workers, 0),
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+            }
+
+
+# Decodes, re-encodes and thumbnails uploaded photos.
+image_pool = ProcessPool(settings.image_workers, settings.image_queue_depth)
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# ``app.config`` reads its settings and ``app.database`` opens its engine when
+# first imported, so point both at a scratch directory before any test does.
+_SCRATCH = Path(tempfile.mkdtemp(prefix="bonsai-tests-"))
+_DATABASE = _SCRATCH / "bonsai.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{_DATABASE}"
+os.environ["MEDIA_ROOT"] = str(_SCRATCH / "media")
+os.environ["RENDITION_ROOT"] = str(_SCRATCH / "renditions")
+
+
+@pytest.fixture
+def client():
+    """The app on a freshly migrated database, with its lifespan running."""
+
+    from fastapi.testclient import TestClient
+
+    from app.cache import detail_cache
+    from app.database import engine
+    from app.main import app
+    from app.migrations import upgrade
+
+    engine.dispose()
+    _DATABASE.unlink(missing_ok=True)
+    upgrade(engine)
+    detail_cache.clear()
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture
+def trees(client):
+    species = client.post("/api/species/", json={"common_name": "Trident maple"}).json()
+    for tree in (
+        {"name": "Juniper", "location": "Bench", "acquisition_date": "2019-04-01"},
+        {"name": "Maple", "species_id": species["id"], "development_stage": "refinement"},
+        {"name": "Pine", "location": "Bench", "status": "graveyard", "acquisition_date": "2022-09-15"},
+        {"name": "Elm", "acquisition_date": "2021-06-30"},
+    ):
+        assert client.post("/api/bonsai/", json=tree).status_code == 201
+    return species
+
+
+def _names(client, path, **params):
+    response = client.get(path, params=params)
+    assert response.status_code == 200
+    body = response.json()
+    return sorted(tree["name"] for tree in (body["items"] if path.endswith("summary") else body))
+
+
+@pytest.mark.parametrize("path", ["/api/bonsai/", "/api/bonsai/summary"])
+def test_list_filters(client, trees, path):
+    assert _names(client, path, status="graveyard") == ["Pine"]
+    assert _names(client, path, species_id=trees["id"]) == ["Maple"]
+    assert _names(client, path, development_stage="refinement") == ["Maple"]
+    assert _names(client, path, location="Bench") == ["Juniper", "Pine"]
+    assert _names(client, path, location="Bench", status="active") == ["Juniper"]
+    assert _names(client, path, acquired_from="2020-01-01") == ["Elm", "Pine"]
+    assert _names(client, path, acquired_from="2020-01-01", acquired_to="2021-12-31") == ["Elm"]
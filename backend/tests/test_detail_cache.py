@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from app.cache import detail_cache
+
+
+def _detail(client, bonsai_id):
+    response = client.get(f"/api/bonsai/{bonsai_id}")
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_repeat_reads_are_served_from_the_cache(client):
+    tree = client.post("/api/bonsai/", json={"name": "Juniper"}).json()
+
+    _detail(client, tree["id"])
+    before = detail_cache.stats()
+    _detail(client, tree["id"])
+
+    assert detail_cache.stats()["hits"] == before["hits"] + 1
+
+
+def test_child_write_invalidates_the_cached_detail(client):
+    tree = client.post("/api/bonsai/", json={"name": "Juniper"}).json()
+    _detail(client, tree["id"])
+    assert detail_cache.stats()["size"] == 1
+
+    update = client.post(f"/api/bonsai/{tree['id']}/updates", json={"title": "Wired"}).json()
+    assert detail_cache.stats()["size"] == 0
+    assert [item["title"] for item in _detail(client, tree["id"])["updates"]] == ["Wired"]
+
+    client.patch(f"/api/bonsai/{tree['id']}/updates/{update['id']}", json={"title": "Unwired"})
+    assert [item["title"] for item in _detail(client, tree["id"])["updates"]] == ["Unwired"]
+
+
+def test_species_edit_drops_every_cached_detail(client):
+    species = client.post("/api/species/", json={"common_name": "Juniper"}).json()
+    trees = [
+        client.post("/api/bonsai/", json={"name": name, "species_id": species["id"]}).json()
+        for name in ("Shimpaku", "Itoigawa")
+    ]
+    for tree in trees:
+        _detail(client, tree["id"])
+
+    client.patch(f"/api/species/{species['id']}", json={"common_name": "Chinese juniper"})
+
+    assert detail_cache.stats()["size"] == 0
+    assert {_detail(client, tree["id"])["species"]["common_name"] for tree in trees} == {"Chinese juniper"}
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import io
+
+from PIL import Image
+
+from app.utils.exif import ORIENTATION_TAG, rotate_jpeg
+
+
+def _jfif_jpeg() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (40, 20), (90, 120, 30)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def test_inserted_exif_follows_jfif_app0():
+    rotated = rotate_jpeg(_jfif_jpeg(), 90)
+
+    assert rotated[2:4] == b"\xff\xe0" and rotated[6:11] == b"JFIF\x00"
+    app0_end = 4 + int.from_bytes(rotated[4:6], "big")
+    assert rotated[app0_end : app0_end + 2] == b"\xff\xe1"
+    assert Image.open(io.BytesIO(rotated)).getexif()[ORIENTATION_TAG] == 6
+
+
+def test_rotation_patches_existing_orientation_in_place():
+    once = rotate_jpeg(_jfif_jpeg(), 90)
+    twice = rotate_jpeg(once, 90)
+
+    assert len(twice) == len(once)
+    assert Image.open(io.BytesIO(twice)).getexif()[ORIENTATION_TAG] == 3
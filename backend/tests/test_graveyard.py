@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import models
+from app.migrations import upgrade
+from app.routers.bonsai import list_graveyard_entries
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'graveyard.db'}")
+    upgrade(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _page(db, category, cursor=None):
+    response = list_graveyard_entries(category=category, limit=1, cursor=cursor, db=db)
+    return json.loads(response.body)
+
+
+def test_cursor_is_bound_to_its_category(db):
+    for index, category in enumerate(["dead", "dead", "sold"]):
+        bonsai = models.Bonsai(name=f"Tree {index}", status="graveyard")
+        db.add(bonsai)
+        db.flush()
+        db.add(models.GraveyardEntry(bonsai_id=bonsai.id, category=category))
+    db.commit()
+
+    first = _page(db, "dead")
+    second = _page(db, "dead", first["next_cursor"])
+    assert [item["bonsai_name"] for item in first["items"] + second["items"]] == ["Tree 1", "Tree 0"]
+    assert second["next_cursor"] is None
+
+    for category in ("sold", None):
+        with pytest.raises(HTTPException) as excinfo:
+            _page(db, category, first["next_cursor"])
+        assert excinfo.value.status_code == 400
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+
+def _create_tree(client, **fields):
+    response = client.post("/api/bonsai/", json={"name": "Juniper", **fields})
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_detail_revalidates_with_etag(client):
+    tree = _create_tree(client)
+
+    first = client.get(f"/api/bonsai/{tree['id']}")
+    etag = first.headers["etag"]
+    repeat = client.get(f"/api/bonsai/{tree['id']}", headers={"If-None-Match": etag})
+
+    assert repeat.status_code == 304
+    assert repeat.content == b""
+    assert repeat.headers["etag"] == etag
+
+
+def test_detail_etag_changes_after_a_child_write(client):
+    tree = _create_tree(client)
+    etag = client.get(f"/api/bonsai/{tree['id']}").headers["etag"]
+
+    client.post(f"/api/bonsai/{tree['id']}/updates", json={"title": "Repotted"})
+    response = client.get(f"/api/bonsai/{tree['id']}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert [update["title"] for update in response.json()["updates"]] == ["Repotted"]
+
+
+def test_list_revalidates_until_the_collection_changes(client):
+    _create_tree(client)
+    etag = client.get("/api/bonsai/").headers["etag"]
+
+    assert client.get("/api/bonsai/", headers={"If-None-Match": etag}).status_code == 304
+
+    _create_tree(client, name="Maple")
+    response = client.get("/api/bonsai/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert {tree["name"] for tree in response.json()} == {"Juniper", "Maple"}
+
+
+def test_etag_depends_on_the_query(client):
+    _create_tree(client)
+    etag = client.get("/api/bonsai/").headers["etag"]
+
+    filtered = client.get("/api/bonsai/", params={"status": "active"}, headers={"If-None-Match": etag})
+
+    assert filtered.status_code == 200
+    assert filtered.headers["etag"] != etag
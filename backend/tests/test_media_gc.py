@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import models
+from app.media_gc import collect_garbage
+from app.migrations import upgrade
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'gc.db'}")
+    upgrade(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def test_absolute_paths_outside_media_root_do_not_abort_the_run(db, tmp_path):
+    root = tmp_path / "media"
+    (root / "full").mkdir(parents=True)
+    (root / "full" / "kept.jpg").write_bytes(b"kept")
+    (root / "full" / "orphan.jpg").write_bytes(b"orphan")
+    bonsai = models.Bonsai(name="Juniper")
+    db.add(bonsai)
+    db.flush()
+    db.add(
+        models.Photo(
+            bonsai_id=bonsai.id,
+            full_path="full/kept.jpg",
+            thumbnail_path=str(tmp_path / "elsewhere" / "thumb.jpg"),
+        )
+    )
+    db.commit()
+
+    report = collect_garbage(db, delete=True, grace_seconds=0, root=root)
+
+    assert report.orphaned_files == 1
+    assert report.deleted_files == 1
+    assert (root / "full" / "kept.jpg").exists()
+    assert not (root / "full" / "orphan.jpg").exists()
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+from PIL import Image
+
+
+def _jpeg(color) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (160, 120), color).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def tree(client):
+    return client.post("/api/bonsai/", json={"name": "Juniper"}).json()
+
+
+def test_batch_reports_each_file_and_keeps_the_good_ones(client, tree):
+    files = [
+        ("files", ("front.jpg", _jpeg((10, 80, 10)), "image/jpeg")),
+        ("files", ("notes.txt", b"not an image", "text/plain")),
+        ("files", ("back.jpg", _jpeg((80, 10, 10)), "image/jpeg")),
+    ]
+
+    response = client.post(
+        f"/api/bonsai/{tree['id']}/photos/batch", files=files, data={"primary_index": "2"}
+    )
+
+    assert response.status_code == 201
+    items = response.json()
+    assert [item["filename"] for item in items] == ["front.jpg", "notes.txt", "back.jpg"]
+    assert [item["photo"] is None for item in items] == [False, True, False]
+    assert items[1]["error"] == "The file could not be processed as an image."
+    stored = client.get(f"/api/bonsai/{tree['id']}/photos").json()
+    assert sorted(photo["id"] for photo in stored) == sorted(items[index]["photo"]["id"] for index in (0, 2))
+    assert [photo["id"] for photo in stored if photo["is_primary"]] == [items[2]["photo"]["id"]]
+
+
+def test_batch_with_no_usable_file_is_rejected(client, tree):
+    files = [
+        ("files", ("a.txt", b"not an image", "text/plain")),
+        ("files", ("b.txt", b"nor this", "text/plain")),
+    ]
+
+    response = client.post(f"/api/bonsai/{tree['id']}/photos/batch", files=files)
+
+    assert response.status_code == 422
+    assert [item["filename"] for item in response.json()["detail"]] == ["a.txt", "b.txt"]
+    assert client.get(f"/api/bonsai/{tree['id']}/photos").json() == []
+
+
+def test_batch_validates_primary_index(client, tree):
+    response = client.post(
+        f"/api/bonsai/{tree['id']}/photos/batch",
+        files=[("files", ("a.jpg", _jpeg((1, 2, 3)), "image/jpeg"))],
+        data={"primary_index": "1"},
+    )
+
+    assert response.status_code == 400
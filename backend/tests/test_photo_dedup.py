@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import io
+
+from PIL import Image
+
+from app.config import settings
+from app.workers import image_pool
+
+
+def _upload(client, bonsai_id, data):
+    response = client.post(
+        f"/api/bonsai/{bonsai_id}/photos", files={"file": ("tree.jpg", data, "image/jpeg")}
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def _stored(url):
+    return settings.media_root / url.removeprefix(f"{settings.media_url}/")
+
+
+def test_identical_uploads_share_files_until_the_last_photo_goes(client):
+    buffer = io.BytesIO()
+    Image.new("RGB", (320, 240), (40, 90, 60)).save(buffer, "JPEG")
+    first_tree, second_tree = (
+        client.post("/api/bonsai/", json={"name": name}).json() for name in ("Juniper", "Maple")
+    )
+
+    first = _upload(client, first_tree["id"], buffer.getvalue())
+    processed = image_pool.stats()["completed"]
+    second = _upload(client, second_tree["id"], buffer.getvalue())
+
+    # The second upload was matched by hash and never reached the image pool.
+    assert image_pool.stats()["completed"] == processed
+    assert (second["full_url"], second["thumbnail_url"]) == (first["full_url"], first["thumbnail_url"])
+
+    files = [_stored(first["full_url"]), _stored(first["thumbnail_url"])]
+    client.delete(f"/api/bonsai/{first_tree['id']}/photos/{first['id']}")
+    assert all(path.is_file() for path in files)
+
+    client.delete(f"/api/bonsai/{second_tree['id']}/photos/{second['id']}")
+    assert not any(path.exists() for path in files)
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app import models
+from app.migrations import upgrade
+from app.query_plans import check_query_plans, explain, full_scans, hot_queries
+from app.routers.bonsai import _paginate_summaries, _summary_query
+from app.routers.notifications import _notifications_query
+
+
+@pytest.fixture
+def migrated_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    upgrade(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_hot_queries_use_indexes(migrated_engine):
+    assert check_query_plans(migrated_engine) == {}
+
+
+def test_unread_notifications_plan_matches_route(migrated_engine):
+    with migrated_engine.connect() as conn, Session(bind=conn) as session:
+        checked = dict(hot_queries(session))["unread notifications"]
+        route = _notifications_query(session, read=False).statement
+        assert str(checked.compile(dialect=conn.dialect)) == str(route.compile(dialect=conn.dialect))
+        assert full_scans(explain(conn, checked)) == []
+
+
+def test_full_scans_flags_child_table_scans():
+    plan = ["SCAN photos", "SEARCH measurements USING INDEX ix_measurements_bonsai_id (bonsai_id=?)"]
+    assert full_scans(plan) == ["SCAN photos"]
+
+
+@pytest.mark.parametrize(
+    "sort", ["-created_at", "created_at", "name", "-name", "acquisition_date", "-acquisition_date"]
+)
+def test_summary_pages_read_bonsai_in_index_order(migrated_engine, sort):
+    with Session(migrated_engine) as session:
+        session.add_all(models.Bonsai(name=f"Tree {index}") for index in range(3))
+        session.commit()
+
+        first = _paginate_summaries(_summary_query(session), sort, 1, None)
+        statements = []
+
+        @event.listens_for(migrated_engine, "before_cursor_execute")
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        _paginate_summaries(_summary_query(session), sort, 1, first.next_cursor)
+        event.remove(migrated_engine, "before_cursor_execute", record)
+
+        statement, parameters = next(item for item in statements if "FROM bonsai" in item[0])
+        with migrated_engine.connect() as conn:
+            plan = [row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+
+    assert not [line for line in plan if line == "SCAN bonsai" or "TEMP B-TREE" in line], plan
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import os
+
+from PIL import Image
+
+from app import renditions as renditions_module
+from app.renditions import DiskLRUCache, RenditionStore, _render, renditions
+
+
+def _sideways_jpeg(path, size):
+    # Stored landscape, displayed portrait.
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    Image.new("RGB", size, (90, 120, 30)).save(path, "JPEG", exif=exif)
+
+
+def test_rotated_source_is_fitted_to_the_requested_width(tmp_path):
+    source = tmp_path / "source.jpg"
+    _sideways_jpeg(source, (600, 400))
+    destination = tmp_path / "256" / "rendition.jpg"
+
+    _render(destination, source, 256)
+
+    with Image.open(destination) as rendition:
+        assert rendition.size == (256, 384)
+
+
+def _fill(cache, key, size):
+    path = cache.path_for(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    cache.add(key)
+
+
+def test_cache_evicts_the_least_recently_used_files(tmp_path):
+    cache = DiskLRUCache(tmp_path, max_bytes=30)
+    for key in ("256/a.jpg", "256/b.jpg", "256/c.jpg"):
+        _fill(cache, key, 10)
+    assert cache.get("256/a.jpg") is not None
+
+    _fill(cache, "512/d.jpg", 10)
+
+    assert cache.get("256/b.jpg") is None
+    assert not (tmp_path / "256" / "b.jpg").exists()
+    assert cache.stats()["bytes"] == 30
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_recovers_recency_from_disk(tmp_path):
+    cache = DiskLRUCache(tmp_path, max_bytes=30)
+    for key in ("a.jpg", "b.jpg", "c.jpg"):
+        _fill(cache, key, 10)
+    # mtimes are the only record a restart has; make them distinct.
+    for offset, key in enumerate(("b.jpg", "c.jpg", "a.jpg")):
+        os.utime(tmp_path / key, ns=(1_000_000_000 * (offset + 1),) * 2)
+
+    restarted = DiskLRUCache(tmp_path, max_bytes=30)
+    _fill(restarted, "d.jpg", 10)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["a.jpg", "c.jpg", "d.jpg"]
+
+
+def test_concurrent_requests_render_a_variant_once(tmp_path, monkeypatch):
+    class InlinePool:
+        async def run(self, func, *args):
+            await asyncio.sleep(0.01)
+            return func(*args)
+
+    monkeypatch.setattr(renditions_module, "image_pool", InlinePool())
+    store = RenditionStore(DiskLRUCache(tmp_path, max_bytes=1024))
+    rendered = []
+
+    def render(destination, label):
+        rendered.append(label)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.write_bytes(label.encode())
+
+    async def requests():
+        return await asyncio.gather(*(store.get_or_render("256/a.jpg", render, "a") for _ in range(5)))
+
+    paths = asyncio.run(requests())
+
+    assert rendered == ["a"]
+    assert {path.read_bytes() for path in paths} == {b"a"}
+    assert (store.stats()["generated"], store.stats()["deduplicated"]) == (1, 4)
+    assert asyncio.run(store.get_or_render("256/a.jpg", render, "b")).read_bytes() == b"a"
+
+
+def test_rendition_route_serves_cached_variants(client, tmp_path):
+    source = tmp_path / "tree.jpg"
+    _sideways_jpeg(source, (600, 400))
+    tree = client.post("/api/bonsai/", json={"name": "Juniper"}).json()
+    photo = client.post(
+        f"/api/bonsai/{tree['id']}/photos", files={"file": ("tree.jpg", source.read_bytes(), "image/jpeg")}
+    ).json()
+    generated = renditions.stats()["generated"]
+
+    first = client.get(f"/media/r/256/{photo['id']}")
+    second = client.get(f"/media/r/256/{photo['id']}", headers={"If-None-Match": first.headers["etag"]})
+
+    assert first.status_code == 200
+    assert Image.open(io.BytesIO(first.content)).size == (256, 384)
+    assert second.status_code == 304
+    assert renditions.stats()["generated"] == generated + 1
+    assert client.get(f"/media/r/300/{photo['id']}").status_code == 404
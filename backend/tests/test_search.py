@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import models
+from app.migrations import upgrade
+from app.search import rebuild_search_index, search_documents, suspend_search_triggers
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    upgrade(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def test_snippets_escape_document_text(db):
+    db.add(models.Bonsai(name="Juniper", notes="Wired <img src=x onerror=alert(1)> & pinched"))
+    db.commit()
+
+    [result] = search_documents(db, "pinched", limit=10)
+
+    assert result["snippet"] == "Wired &lt;img src=x onerror=alert(1)&gt; &amp; <mark>pinched</mark>"
+
+
+def _hits(db, query):
+    return [(result["kind"], result["title"]) for result in search_documents(db, query, limit=10)]
+
+
+def test_triggers_follow_inserts_updates_and_deletes(db):
+    bonsai = models.Bonsai(name="Shimpaku", location="Greenhouse")
+    db.add(bonsai)
+    db.flush()
+    update = models.BonsaiUpdate(bonsai_id=bonsai.id, title="Repotted", description="Akadama mix")
+    db.add(update)
+    db.commit()
+    assert _hits(db, "greenhouse") == [("bonsai", "Shimpaku")]
+    assert _hits(db, "akadama") == [("update", "Repotted")]
+
+    bonsai.name = "Itoigawa"
+    db.commit()
+    assert _hits(db, "shimpaku") == []
+    assert _hits(db, "itoigawa") == [("bonsai", "Itoigawa")]
+
+    db.delete(update)
+    db.commit()
+    assert _hits(db, "akadama") == []
+
+
+def test_suspended_triggers_leave_the_index_to_the_rebuild(db):
+    suspend_search_triggers(db)
+    db.add(models.Species(common_name="Trident maple", care_instructions="Defoliate in June"))
+    db.flush()
+    assert _hits(db, "defoliate") == []
+
+    rebuild_search_index(db)
+    db.commit()
+    assert _hits(db, "defoliate") == [("species", "Trident maple")]
+
+    # The rebuild lifts the suspension, so later writes are indexed again.
+    db.add(models.Species(common_name="Japanese black pine"))
+    db.commit()
+    assert _hits(db, "black") == [("species", "Japanese black pine")]
+
+
+def test_suspension_is_rolled_back_with_a_failed_load(db):
+    suspend_search_triggers(db)
+    db.rollback()
+
+    db.add(models.Bonsai(name="Hornbeam"))
+    db.commit()
+    assert _hits(db, "hornbeam") == [("bonsai", "Hornbeam")]
+
+
+def test_title_matches_outrank_body_matches(db):
+    db.add_all(
+        [
+            models.Bonsai(name="Elm", notes="Grown from a juniper cutting swap"),
+            models.Bonsai(name="Juniper"),
+        ]
+    )
+    db.commit()
+
+    assert _hits(db, "juniper") == [("bonsai", "Juniper"), ("bonsai", "Elm")]
+
+
+def test_backup_import_reindexes_the_restored_rows(client):
+    client.post("/api/bonsai/", json={"name": "Shimpaku", "notes": "Jin carved on the apex"})
+    archive = client.get("/api/backup/export").content
+    client.post("/api/bonsai/", json={"name": "Hornbeam"})
+
+    response = client.post("/api/backup/import", files={"file": ("backup.zip", archive, "application/zip")})
+    assert response.status_code == 200
+
+    def titles(query):
+        return [item["title"] for item in client.get("/api/search/", params={"q": query}).json()["items"]]
+
+    assert titles("apex") == ["Shimpaku"]
+    assert titles("hornbeam") == []
+    client.post("/api/bonsai/", json={"name": "Hornbeam"})
+    assert titles("hornbeam") == ["Hornbeam"]
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+from PIL import Image
+
+from app.utils.images import DERIVATIVE_FORMATS, derivative_formats
+
+
+@pytest.fixture
+def thumbnail_url(client):
+    buffer = io.BytesIO()
+    Image.linear_gradient("L").resize((800, 600)).convert("RGB").save(buffer, "PNG")
+    tree = client.post("/api/bonsai/", json={"name": "Juniper"}).json()
+    photo = client.post(
+        f"/api/bonsai/{tree['id']}/photos", files={"file": ("screen.png", buffer.getvalue(), "image/png")}
+    ).json()
+    return photo["thumbnail_url"]
+
+
+@pytest.mark.skipif(not derivative_formats(), reason="Pillow cannot encode any derivative format")
+def test_preferred_derivative_is_served_when_accepted(client, thumbnail_url):
+    preferred = DERIVATIVE_FORMATS[derivative_formats()[0]][1]
+
+    response = client.get(thumbnail_url, headers={"Accept": "image/avif,image/webp,image/*;q=0.8"})
+
+    assert response.headers["content-type"] == preferred
+    assert response.headers["vary"] == "Accept"
+    assert Image.open(io.BytesIO(response.content)).size == Image.open(
+        io.BytesIO(client.get(thumbnail_url).content)
+    ).size
+
+
+@pytest.mark.parametrize("accept", [None, "image/*", "image/avif;q=0, image/webp;q=0, image/png"])
+def test_original_format_is_the_fallback(client, thumbnail_url, accept):
+    headers = {"Accept": accept} if accept else {}
+
+    response = client.get(thumbnail_url, headers=headers)
+
+    assert response.headers["content-type"] == "image/png"
+    assert response.headers["vary"] == "Accept"
+
+
+@pytest.mark.skipif("webp" not in derivative_formats(), reason="Pillow cannot encode WebP")
+def test_thumbnail_metrics_report_derivative_savings(client, thumbnail_url):
+    webp = client.get("/api/metrics/thumbnails").json()["formats"]["webp"]
+
+    assert webp["files"] >= 1
+    assert webp["saved_bytes"] == webp["original_bytes"] - webp["bytes"] > 0
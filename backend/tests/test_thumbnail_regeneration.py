@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.migrations import upgrade
+from app.thumbnails import Checkpoint, _fingerprint, regenerate_thumbnails
+
+
+class InterruptedExecutor(ThreadPoolExecutor):
+    """Runs ``batches`` batches, then stops the run like Ctrl-C would."""
+
+    def __init__(self, batches: int) -> None:
+        super().__init__(max_workers=1)
+        self.batches = batches
+
+    def map(self, *args, **kwargs):
+        if self.batches == 0:
+            raise KeyboardInterrupt
+        self.batches -= 1
+        return super().map(*args, **kwargs)
+
+
+@pytest.fixture
+def photos(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "media_root", tmp_path / "media")
+    engine = create_engine(f"sqlite:///{tmp_path / 'regen.db'}")
+    upgrade(engine)
+    with Session(engine) as db:
+        bonsai = models.Bonsai(name="Juniper")
+        db.add(bonsai)
+        db.flush()
+        for index in range(3):
+            full = settings.media_root / "full" / f"{index}.jpg"
+            full.parent.mkdir(parents=True, exist_ok=True)
+            Image.new("RGB", (640, 480), (index * 60, 90, 30)).save(full, "JPEG")
+            db.add(
+                models.Photo(
+                    bonsai_id=bonsai.id, full_path=f"full/{index}.jpg", thumbnail_path=f"thumbs/{index}.jpg"
+                )
+            )
+        db.commit()
+        yield db
+    engine.dispose()
+
+
+def _thumbnails(db):
+    return [path for (path,) in db.query(models.Photo.thumbnail_path).order_by(models.Photo.id)]
+
+
+def test_interrupted_run_resumes_after_the_last_finished_batch(photos, tmp_path):
+    checkpoint = Checkpoint(tmp_path / "checkpoint.json", _fingerprint([], [], True))
+
+    with InterruptedExecutor(batches=2) as executor, pytest.raises(KeyboardInterrupt):
+        regenerate_thumbnails(photos, executor, checkpoint, force=True, batch_size=1)
+    assert checkpoint.load() == 2
+    done = _thumbnails(photos)[:2]
+    assert _thumbnails(photos)[2] == "thumbs/2.jpg" and "thumbs/0.jpg" not in done
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        report = regenerate_thumbnails(photos, executor, checkpoint, force=True, batch_size=1)
+
+    assert (report.resumed_after, report.regenerated) == (2, 1)
+    assert _thumbnails(photos)[:2] == done
+    assert all((settings.media_root / path).is_file() for path in _thumbnails(photos))
+    assert not checkpoint.path.exists()
+
+
+def test_checkpoint_from_other_options_is_ignored(photos, tmp_path):
+    Checkpoint(tmp_path / "checkpoint.json", _fingerprint([1], [], True)).save(2)
+    checkpoint = Checkpoint(tmp_path / "checkpoint.json", _fingerprint([], [], True))
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        report = regenerate_thumbnails(photos, executor, checkpoint, force=True)
+
+    assert (report.resumed_after, report.regenerated) == (0, 3)
+
+
+def test_current_thumbnails_are_skipped(photos, tmp_path):
+    checkpoint = Checkpoint(tmp_path / "checkpoint.json", _fingerprint([], [], False))
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = regenerate_thumbnails(photos, executor, checkpoint)
+        second = regenerate_thumbnails(photos, executor, checkpoint)
+
+    assert (first.regenerated, second.regenerated, second.skipped) == (3, 0, 3)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from PIL import Image, JpegImagePlugin
+
+from app.utils.images import write_thumbnail
+
+
+def test_jpeg_thumbnails_are_decoded_at_reduced_scale(tmp_path, monkeypatch):
+    source = tmp_path / "large.jpg"
+    Image.new("RGB", (4000, 3000), (90, 120, 30)).save(source, "JPEG")
+    decoded_sizes = []
+    draft = JpegImagePlugin.JpegImageFile.draft
+
+    def recording_draft(image, mode, size):
+        result = draft(image, mode, size)
+        decoded_sizes.append(image.size)
+        return result
+
+    monkeypatch.setattr(JpegImagePlugin.JpegImageFile, "draft", recording_draft)
+    destination = tmp_path / "thumb.jpg"
+
+    write_thumbnail(source, destination, box=(300, 300))
+
+    # The smallest DCT scale leaving twice the box to resample from is 1/4.
+    assert decoded_sizes[0] == (1000, 750)
+    with Image.open(destination) as thumbnail:
+        assert thumbnail.size == (300, 225)
+
+
+def test_other_formats_keep_their_format_and_aspect(tmp_path):
+    source = tmp_path / "screenshot.png"
+    Image.new("RGB", (2000, 1000), (200, 200, 200)).save(source, "PNG")
+    destination = tmp_path / "thumb.png"
+
+    write_thumbnail(source, destination, box=(200, 200))
+
+    with Image.open(destination) as thumbnail:
+        assert (thumbnail.format, thumbnail.size) == ("PNG", (200, 100))
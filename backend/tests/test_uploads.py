@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from PIL import Image
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.config import settings
+from app.utils.uploads import UploadSizeLimitMiddleware, spooled_upload
+
+
+def _jpeg(size=(64, 48)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (90, 120, 30)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def limited_client():
+    async def upload(request):
+        return PlainTextResponse(str(len(await request.body())))
+
+    app = Starlette(routes=[Route("/upload", upload, methods=["POST"])])
+    app.add_middleware(UploadSizeLimitMiddleware, limits=[(r"^/upload$", 10)])
+    return TestClient(app)
+
+
+def test_declared_length_over_the_limit_is_refused(limited_client):
+    assert limited_client.post("/upload", content=b"x" * 10).text == "10"
+    assert limited_client.post("/upload", content=b"x" * 11).status_code == 413
+
+
+def test_streamed_body_is_cut_off_at_the_limit(limited_client):
+    def chunks():
+        for _ in range(4):
+            yield b"x" * 4
+
+    response = limited_client.post("/upload", content=chunks())
+
+    assert response.status_code == 413
+
+
+def test_spooled_upload_hashes_in_chunks_and_cleans_up(monkeypatch):
+    monkeypatch.setattr(settings, "upload_chunk_size", 7)
+    data = bytes(range(256)) * 3
+
+    async def spool():
+        async with spooled_upload(UploadFile(io.BytesIO(data)), max_bytes=len(data), suffix=".bin") as upload:
+            return upload, upload.path.read_bytes()
+
+    upload, stored = asyncio.run(spool())
+
+    assert stored == data
+    assert (upload.size, upload.sha256) == (len(data), hashlib.sha256(data).hexdigest())
+    assert upload.path.suffix == ".bin"
+    assert not upload.path.exists()
+
+
+def test_spooled_upload_stops_at_max_bytes(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "upload_chunk_size", 4)
+    monkeypatch.setattr(settings, "upload_tmp_dir", tmp_path)
+    spooled = []
+
+    async def spool():
+        async with spooled_upload(UploadFile(io.BytesIO(b"x" * 32)), max_bytes=10) as upload:
+            spooled.append(upload)
+
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(spool())
+
+    assert excinfo.value.status_code == 413
+    assert spooled == []
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_photo_upload_is_stored_from_the_spooled_file(client, monkeypatch):
+    tree = client.post("/api/bonsai/", json={"name": "Juniper"}).json()
+    image = _jpeg()
+
+    response = client.post(
+        f"/api/bonsai/{tree['id']}/photos", files={"file": ("tree.jpg", image, "image/jpeg")}
+    )
+    assert response.status_code == 201
+    assert client.get(response.json()["full_url"]).status_code == 200
+
+    monkeypatch.setattr(settings, "max_photo_upload_bytes", len(image) - 1)
+    response = client.post(
+        f"/api/bonsai/{tree['id']}/photos", files={"file": ("tree.jpg", image, "image/jpeg")}
+    )
+    assert response.status_code == 413
+    assert len(client.get(f"/api/bonsai/{tree['id']}/photos").json()) == 1
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+"""Compare full-resolution and reduced-resolution JPEG thumbnail generation.
+
+Each measurement runs in a fresh Python process so the reported peak RSS
+belongs to that single decode. The ``full`` method reproduces the previous
+pipeline (decode everything, transpose, copy, ``thumbnail``); ``draft`` is
+``app.utils.images.write_thumbnail``.
+
+    python scripts/benchmark_thumbnails.py --megapixels 12 24 48 --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageOps
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = REPO_ROOT / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+METHODS = ("full", "draft")
+
+
+def _peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows has no resource module
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _full_decode_thumbnail(source: Path, destination: Path) -> None:
+    from app.config import settings
+
+    with Image.open(source) as image:
+        oriented = ImageOps.exif_transpose(image)
+        preview = oriented.copy()
+        preview.thumbnail((settings.thumbnail_size, settings.thumbnail_size))
+        preview.save(destination, format="JPEG")
+
+
+def _run_once(method: str, source: Path) -> None:
+    from app.utils.images import write_thumbnail
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        destination = Path(tmp_dir) / "thumb.jpg"
+        started = time.perf_counter()
+        if method == "full":
+            _full_decode_thumbnail(source, destination)
+        else:
+            write_thumbnail(source, destination, "JPEG")
+        elapsed = time.perf_counter() - started
+    print(json.dumps({"seconds": elapsed, "peak_rss_mb": _peak_rss_mb()}))
+
+
+def _sample_path(megapixels: int, directory: Path) -> Path:
+    return directory / f"sample_{megapixels}mp.jpg"
+
+
+def _make_sample(megapixels: int, path: Path) -> None:
+    width = int((megapixels * 1_000_000 * 4 / 3) ** 0.5)
+    height = megapixels * 1_000_000 // width
+    # Gradients plus some shapes compress like a photo rather than flat colour.
+    image = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+    draw = ImageDraw.Draw(image)
+    for index in range(0, width, max(width // 40, 1)):
+        draw.ellipse(
+            (index, index % height, index + width // 10, index % height + height // 10),
+            fill=(index % 255, 120, 255 - index % 255),
+        )
+    image.save(path, format="JPEG", quality=90)
+
+
+def _ensure_sample(megapixels: int, directory: Path) -> Path:
+    path = _sample_path(megapixels, directory)
+    if not path.exists():
+        # Generated in a child process: peak RSS is inherited across fork and exec,
+        # so building a 48 MP image here would inflate every later measurement.
+        subprocess.run(
+            [sys.executable, __file__, "--make", str(megapixels), str(path)], check=True
+        )
+    return path
+
+
+def _measure(method: str, source: Path, repeat: int) -> dict[str, float | None]:
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, __file__, "--run", method, str(source)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        runs.append(json.loads(output))
+    peaks = [run["peak_rss_mb"] for run in runs if run["peak_rss_mb"] is not None]
+    return {
+        "seconds": statistics.median(run["seconds"] for run in runs),
+        "peak_rss_mb": max(peaks) if peaks else None,
+    }
+
+
+def _get_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--megapixels", type=int, nargs="+", default=[12, 24, 48])
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Runs per method and size (median reported)."
+    )
+    parser.add_argument(
+        "--samples",
+        type=Path,
+        default=None,
+        help="Directory for generated sample JPEGs (default: a temporary directory).",
+    )
+    parser.add_argument("--run", nargs=2, metavar=("METHOD", "PATH"), help=argparse.SUPPRESS)
+    parser.add_argument("--make", nargs=2, metavar=("MEGAPIXELS", "PATH"), help=argparse.SUPPRESS)
+    return parser
+
+
+def main() -> None:
+    args = _get_arg_parser().parse_args()
+    if args.run:
+        method, source = args.run
+        _run_once(method, Path(source))
+        return
+    if args.make:
+        megapixels, path = args.make
+        _make_sample(int(megapixels), Path(path))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        samples_dir = args.samples or Path(tmp_dir)
+        samples_dir.mkdir(parents=True, exist_ok=True)
+
+        print(f"{'input':>8}  {'method':<6}  {'median ms':>10}  {'peak RSS MB':>11}")
+        for megapixels in args.megapixels:
+            source = _ensure_sample(megapixels, samples_dir)
+            for method in METHODS:
+                result = _measure(method, source, args.repeat)
+                peak = result["peak_rss_mb"]
+                print(
+                    f"{megapixels:>6}MP  {method:<6}  {result['seconds'] * 1000:>10.1f}  "
+                    f"{'n/a' if peak is None else f'{peak:.1f}':>11}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -77,6 +77,11 @@ const mapPhoto = (photo) => {
     date: photo.taken_at ?? photo.takenAt ?? null,
     takenAt: photo.taken_at ?? photo.takenAt ?? null,
     isPrimary: photo.is_primary ?? photo.isPrimary ?? false,
+    width: photo.width ?? null,
+    height: photo.height ?? null,
+    byteSize: photo.byte_size ?? photo.byteSize ?? null,
+    dominantColor: photo.dominant_color ?? photo.dominantColor ?? null,
+    blurhash: photo.blurhash ?? null,
   };
 };
 
@@ -763,23 +768,9 @@ export const TreesProvider = ({ children }) => {
         `/bonsai/${treeId}/photos/${photoId}`,
         data
       );
-      let mappedPhoto = mapPhoto(response);
-
-      if (
-        data &&
-        typeof data.rotate_degrees === "number" &&
-        data.rotate_degrees % 360 !== 0
-      ) {
-        const cacheBuster = Date.now();
-        const appendCacheBust = (input) =>
-          input ? `${input}${input.includes("?") ? "&" : "?"}v=${cacheBuster}` : input;
-        mappedPhoto = {
-          ...mappedPhoto,
-          url: appendCacheBust(mappedPhoto.url),
-          thumbnailUrl: appendCacheBust(mappedPhoto.thumbnailUrl),
-          fullUrl: appendCacheBust(mappedPhoto.fullUrl),
-        };
-      }
+      // Rotation stores the image under a new filename, so the returned URLs
+      // already differ from the cached ones.
+      const mappedPhoto = mapPhoto(response);
 
       updateTreeReferences(treeId, (tree) => {
         const existingPhotos = Array.isArray(tree.photos) ? tree.photos : [];
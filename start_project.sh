@@ -129,6 +129,9 @@ ensure_backend() {
     echo "Installing backend dependencies"
     "$venv_python" -m pip install --upgrade pip >/dev/null
     "$venv_python" -m pip install -r requirements.txt
+
+    echo "Applying database migrations"
+    "$venv_python" -m app.migrations upgrade
   fi
 
   popd >/dev/null